@@ -32,8 +32,8 @@ def get_status():
         "lastTrade": None,
         "uptime": state["uptime_seconds"],
         # Use session stats for P&L and Trades
-        "tradesExecuted": deriv_client.session_stats["trades"],
-        "profitToday": deriv_client.session_stats["pnl"],
+        "tradesExecuted": deriv_client.session_stats.trades,
+        "profitToday": deriv_client.session_stats.pnl,
         "account": deriv_client.active_account_id,
         "symbols": deriv_client.enabled_symbols
     }
@@ -6,4 +6,4 @@ router = APIRouter()
 @router.get("/")
 async def get_logs():
     """Returns the last 100 log entries from the in-memory buffer."""
-    return stream_manager.log_history
+    return list(stream_manager.log_history)
@@ -10,7 +10,7 @@ async def get_symbols():
 
 @router.get("/positions/")
 async def get_positions():
-    return deriv_client.open_positions
+    return list(deriv_client.open_positions.values())
 
 @router.get("/candles/{symbol}")
 async def get_candles(symbol: str, granularity: int = 60, count: int = 100):
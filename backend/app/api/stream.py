@@ -1,4 +1,3 @@
-import json
 import asyncio
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request
 from sse_starlette.sse import EventSourceResponse
@@ -24,9 +23,10 @@ async def sse_feed(request: Request):
             while True:
                 if await request.is_disconnected():
                     break
+                # Frames arrive already serialized by the stream manager
                 data = await queue.get()
                 yield {
-                    "data": json.dumps(data)
+                    "data": data
                 }
         finally:
             stream_manager.unsubscribe_sse(queue)
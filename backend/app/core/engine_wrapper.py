@@ -1,10 +1,21 @@
 import ctypes
 import os
-import json
-from ctypes import c_char_p, c_int, c_void_p
+import threading
+from typing import Tuple, Union
+from ctypes import c_char_p, c_double, c_int, c_void_p
+
+from app.core.fast_json import loads as json_loads
+
+# Buffer handed to execute_trade_native for the rejection reason
+TRADE_REASON_BUF_SIZE = 256
 
 class EngineWrapper:
     _lib = None
+    # The engine keeps global state and is not re-entrant: every call into the
+    # library holds this, whichever thread (event loop or to_thread worker) makes it
+    _lock = threading.Lock()
+    # False when an older libengine.so without execute_trade_native is loaded
+    _has_native_trade = False
 
     @classmethod
     def _load_lib(cls):
@@ -26,6 +37,13 @@ class EngineWrapper:
                 cls._lib.execute_trade.argtypes = [c_char_p]
                 cls._lib.execute_trade.restype = c_void_p
                 
+                # int execute_trade_native(const char* symbol, double stake, int active_trades,
+                #                          char* reason_buf, int reason_len)
+                if hasattr(cls._lib, "execute_trade_native"):
+                    cls._lib.execute_trade_native.argtypes = [c_char_p, c_double, c_int, c_char_p, c_int]
+                    cls._lib.execute_trade_native.restype = c_int
+                    cls._has_native_trade = True
+                
                 # void set_cooldown(int seconds)
                 cls._lib.set_cooldown.argtypes = [c_int]
                 cls._lib.set_cooldown.restype = None
@@ -59,46 +77,74 @@ class EngineWrapper:
     @classmethod
     def init_engine(cls, config_json: str):
         """Initialize the C++ engine with JSON configuration."""
-        cls._load_lib()
-        c_config = config_json.encode('utf-8')
-        cls._lib.init_engine(c_config)
+        with cls._lock:
+            cls._load_lib()
+            c_config = config_json.encode('utf-8')
+            cls._lib.init_engine(c_config)
 
     @classmethod
     def process_tick(cls, tick_json: str) -> str:
         """Process a tick through the C++ engine (ML logic)."""
-        cls._load_lib()
-        c_tick = tick_json.encode('utf-8')
-        ptr = cls._lib.process_tick(c_tick)
-        return cls._ptr_to_str(ptr)
+        with cls._lock:
+            cls._load_lib()
+            c_tick = tick_json.encode('utf-8')
+            ptr = cls._lib.process_tick(c_tick)
+            return cls._ptr_to_str(ptr)
+
+    @classmethod
+    def execute_trade(cls, params_json: Union[str, bytes]) -> str:
+        """
+        Execute/Validate a trade through the C++ engine safety layer.
+        Accepts UTF-8 bytes directly (e.g. fast_json.dumps_bytes) to skip the encode.
+        """
+        with cls._lock:
+            cls._load_lib()
+            c_params = params_json if isinstance(params_json, bytes) else params_json.encode('utf-8')
+            ptr = cls._lib.execute_trade(c_params)
+            return cls._ptr_to_str(ptr)
+
+    @classmethod
+    def has_native_trade(cls) -> bool:
+        """True if the loaded library exports execute_trade_native."""
+        with cls._lock:
+            cls._load_lib()
+            return cls._has_native_trade
 
     @classmethod
-    def execute_trade(cls, params_json: str) -> str:
-        """Execute/Validate a trade through the C++ engine safety layer."""
-        cls._load_lib()
-        c_params = params_json.encode('utf-8')
-        ptr = cls._lib.execute_trade(c_params)
-        return cls._ptr_to_str(ptr)
+    def execute_trade_native(cls, symbol: str, stake: float, active_trades: int) -> Tuple[bool, str]:
+        """
+        Safety-layer check with plain arguments, skipping the JSON encode/parse
+        on both sides. Returns (approved, reason).
+        """
+        with cls._lock:
+            cls._load_lib()
+            reason = ctypes.create_string_buffer(TRADE_REASON_BUF_SIZE)
+            approved = cls._lib.execute_trade_native(symbol.encode('utf-8'), stake, active_trades,
+                                                     reason, TRADE_REASON_BUF_SIZE)
+            return bool(approved), reason.value.decode('utf-8')
         
     @classmethod
     def set_cooldown(cls, seconds: int):
         """Update cooldown timer dynamically."""
-        cls._load_lib()
-        cls._lib.set_cooldown(seconds)
+        with cls._lock:
+            cls._load_lib()
+            cls._lib.set_cooldown(seconds)
 
     @classmethod
     def set_bot_state(cls, state: bool):
         """Enable/Disable the bot."""
-        cls._load_lib()
-        # void set_bot_state(bool)
-        cls._lib.set_bot_state.argtypes = [ctypes.c_bool]
-        cls._lib.set_bot_state.restype = None
-        cls._lib.set_bot_state(state)
+        with cls._lock:
+            cls._load_lib()
+            # void set_bot_state(bool)
+            cls._lib.set_bot_state.argtypes = [ctypes.c_bool]
+            cls._lib.set_bot_state.restype = None
+            cls._lib.set_bot_state(state)
 
     @classmethod
     def get_bot_state(cls) -> dict:
         """Get bot running state and uptime."""
-        cls._load_lib()
-        
-        ptr = cls._lib.get_bot_state()
-        json_str = cls._ptr_to_str(ptr)
-        return json.loads(json_str)
+        with cls._lock:
+            cls._load_lib()
+            ptr = cls._lib.get_bot_state()
+            json_str = cls._ptr_to_str(ptr)
+            return json_loads(json_str)
@@ -0,0 +1,40 @@
+"""
+Fast JSON helpers.
+Uses orjson when installed and falls back to the stdlib json module otherwise,
+producing the same compact output either way.
+"""
+
+import dataclasses
+import json
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def dumps(obj) -> str:
+        """Serialize to a JSON str (for text frames / C strings)."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+
+    loads = orjson.loads
+
+except ImportError:  # pragma: no cover - depends on environment
+    def _default(obj):
+        # orjson serializes dataclasses natively; mirror that here
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(obj) -> str:
+        """Serialize to a JSON str (for text frames / C strings)."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default)
+
+    def dumps_bytes(obj) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return dumps(obj).encode("utf-8")
+
+    loads = json.loads
@@ -6,6 +6,7 @@ helpers for break-even and trailing behaviour.
 
 from typing import Optional
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,26 @@ class DynamicTakeProfit:
                 return entry_price
 
         return None
+
+    @staticmethod
+    def trailing_updates(
+        current_prices: np.ndarray,
+        entry_prices: np.ndarray,
+        current_sls: np.ndarray,
+        is_buy: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized `check_trailing_update` over many positions at once.
+
+        Returns:
+            Array of new SL prices, NaN where no update applies.
+        """
+        risk_dist = np.where(current_sls > 0, np.abs(entry_prices - current_sls), 0.0)
+        profit_dist = np.where(is_buy, current_prices - entry_prices, entry_prices - current_prices)
+        still_at_risk = np.where(is_buy, current_sls < entry_prices, current_sls > entry_prices)
+
+        move_to_be = (risk_dist != 0) & (profit_dist > risk_dist * 0.25) & still_at_risk
+        return np.where(move_to_be, entry_prices, np.nan)
     
     def calculate_v10_tp(
         self,
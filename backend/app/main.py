@@ -4,6 +4,7 @@ from app.api import bot, accounts, settings, stream, logs, trades, market
 
 from contextlib import asynccontextmanager
 from app.services.deriv_connector import deriv_client
+from app.services import speech_recognition
 import logging
 import sys
 
@@ -23,6 +24,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     await deriv_client.disconnect()
+    await speech_recognition.aclose()
 
 app = FastAPI(title="Intelligent Trading Companion", lifespan=lifespan)
 
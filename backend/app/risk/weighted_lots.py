@@ -23,6 +23,12 @@ class WeightedLotCalculator:
             "unknown": 0.5
         }
         
+        # Multipliers for volatility states (anything else = 1.0)
+        self.volatility_multipliers = {
+            "extreme": 0.5,
+            "high": 0.8
+        }
+        
         # Symbol-specific minimum stake (USD)
         # Based on Deriv Options/Multipliers API defaults
         self.symbol_min_stake = {
@@ -89,11 +95,7 @@ class WeightedLotCalculator:
         conf_multiplier = min(1.0 + (confluences * 0.1), 1.5)
         
         # 5. Volatility adjustment (Adaptive Mode)
-        vol_multiplier = 1.0
-        if volatility == "extreme":
-            vol_multiplier = 0.5
-        elif volatility == "high":
-            vol_multiplier = 0.8
+        vol_multiplier = self.volatility_multipliers.get(volatility, 1.0)
             
         # Final Risk Amount
         weighted_risk = base_risk_amount * confidence_multiplier * reg_multiplier * conf_multiplier * vol_multiplier
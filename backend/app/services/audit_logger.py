@@ -1,9 +1,10 @@
 import logging
 import os
-import json
 from datetime import datetime
 from typing import Any, Dict
 
+from app.core.fast_json import dumps as json_dumps
+
 class AuditLogger:
     def __init__(self, log_dir: str = "logs"):
         self.log_dir = log_dir
@@ -32,7 +33,7 @@ class AuditLogger:
             "validation_adjustment": validation,
             "deriv_response": response
         }
-        self.logger.info(json.dumps(log_entry))
+        self.logger.info(json_dumps(log_entry))
 
     def log_error(self, context: str, error_details: Any):
         """
@@ -44,7 +45,7 @@ class AuditLogger:
             "context": context,
             "details": str(error_details)
         }
-        self.logger.info(json.dumps(log_entry))
+        self.logger.info(json_dumps(log_entry))
 
 # Global Audit Instance
 audit_logger = AuditLogger(log_dir=os.path.abspath(os.path.join(os.path.dirname(__file__), "../../logs")))
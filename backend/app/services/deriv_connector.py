@@ -1,19 +1,29 @@
 import asyncio
+import functools
+import inspect
+import itertools
+import re
+import sys
+import threading
 import time
-import json
 import websockets
 import logging
 import numpy as np
 import uuid
-from typing import Callable, Optional, Dict, Any, List
-from collections import defaultdict, deque
+from typing import Callable, Optional, Dict, Any, List, Tuple
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime
 from app.core.engine_wrapper import EngineWrapper
-from app.services.trade_manager import TradeManager
+from app.api.journal import add_journal_entry, update_journal_entry_by_trade_id
+from app.core.fast_json import dumps as json_dumps, dumps_bytes as json_dumps_bytes, loads as json_loads
+from app.services.trade_manager import TradeManager, TradeSignal, index_contracts
 from app.services.stream_manager import stream_manager
+from app.services.audit_logger import audit_logger
 from app.signals.market_structure import MarketStructure
 from app.signals.indicator_layer import IndicatorLayer
 from app.signals.entry_validator import EntryValidator
+from app.signals.kernels import warm_up as warm_up_indicator_kernels
 from app.exits.smart_stops import SmartStopLoss
 from app.exits.dynamic_tp import DynamicTakeProfit
 from app.exits.scalper_exit import ScalperExitModule
@@ -23,9 +33,88 @@ from app.risk.risk_guard import RiskGuard
 from app.risk.cooldown_manager import CooldownManager
 from app.strategies.master_engine import MasterEngine
 from app.strategies.strategy_manager import StrategyManager
+from app.signals.kernels import rsi_probabilities, sltp_hits
+
+class SessionStats:
+    """Running P&L / trade counters for the current session."""
+    __slots__ = ("pnl", "trades", "wins", "losses")
+
+    def __init__(self):
+        self.pnl = 0.0
+        self.trades = 0
+        self.wins = 0
+        self.losses = 0
+
+# Config keys forwarded to IndicatorLayer.update_params()
+INDICATOR_CONFIG_KEYS = ("rsi_oversold", "rsi_overbought")
+
+class TickRing:
+    """
+    Bounded single-producer/single-consumer tick buffer (listen() -> one symbol's consumer).
+    Pushes are a plain deque append; a wake-up future exists only while the consumer is idle.
+    When full, the oldest tick is overwritten.
+    """
+    __slots__ = ("_buf", "_waiter")
+
+    def __init__(self, capacity: int):
+        self._buf = deque(maxlen=capacity)
+        self._waiter: Optional[asyncio.Future] = None
+
+    def push(self, tick):
+        self._buf.append(tick)
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def pop(self):
+        buf = self._buf
+        while not buf:
+            self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+        return buf.popleft()
+
+@dataclass(slots=True)
+class Position:
+    """
+    Open position as tracked for the dashboard. Field names are the wire format:
+    orjson serializes the dataclass directly, so no per-broadcast dict is built.
+    """
+    id: str
+    symbol: Optional[str]
+    side: str
+    lots: float
+    entryPrice: Optional[float]
+    currentPrice: Optional[float]
+    pnl: float
+    openTime: str
+
+@dataclass(slots=True)
+class TickAnalysis:
+    """
+    Result of SymbolProcessor.analyze(). Everything the tick handler needs from the
+    stack afterwards is captured here under compute_lock, so it never reads the
+    engine while a worker thread may be updating it.
+    """
+    indicator_data: Dict[str, Any]
+    structure_data: Dict[str, Any]
+    market_mode: Optional[str] = None
+    strategy_signal: Optional[Dict[str, Any]] = None
+    volatility_state: Optional[str] = None
+    atr: float = 0.0
+    spike_counter: int = 0
+    strategy_info: Optional[Dict[str, Any]] = None
+    rsi_hybrid: Optional[Dict[str, Any]] = None
 
 class SymbolProcessor:
     """Manages the full analysis stack for a single symbol."""
+    __slots__ = (
+        "symbol", "engine", "market_structure", "indicator_layer", "entry_validator",
+        "strategy_manager", "tick_count", "smart_sl", "dynamic_tp",
+        "_indicator_update", "tick", "compute_lock", "_inbox", "last_candle_1m",
+    )
+
     def __init__(self, symbol: str, config: Dict[str, Any] = None):
         self.symbol = symbol
         self.engine = MasterEngine()
@@ -35,14 +124,23 @@ class SymbolProcessor:
         self.strategy_manager = StrategyManager()
         self.strategy_manager.select_strategy_by_symbol(symbol)
         self.tick_count = 0
-        self.candle_counts = {"1m": 0, "5m": 0, "15m": 0, "1h": 0}
+        # Algo-facing tick, refilled in place per tick (consumers only read it during the call)
+        self.tick = {"symbol": symbol, "quote": 0.0, "high": 0.0, "low": 0.0, "open": 0.0, "epoch": 0}
+        # Every read/mutation of the stack holds this, and always in a worker thread
+        # (analyze / run_locked), so the event loop never blocks on it
+        self.compute_lock = threading.Lock()
+        # Mutations queued from the event loop (post), applied under the lock before the
+        # next locked section; deque append/popleft are thread-safe
+        self._inbox: deque = deque()
+        # Latest closed 1m candle, republished under the lock after every locked section.
+        # Closed candles are never mutated, so the loop may read this reference freely.
+        self.last_candle_1m: Optional[Dict[str, Any]] = None
+        # Resolved once; apply_config() runs on every config push
+        self._indicator_update = getattr(self.indicator_layer, 'update_params', None)
         
         # Apply config if provided
-        if config and hasattr(self.indicator_layer, 'update_params'):
-            self.indicator_layer.update_params(
-                rsi_oversold = config.get("rsi_oversold"),
-                rsi_overbought = config.get("rsi_overbought")
-            )
+        if config:
+            self.apply_config(config)
         
         # Link for RSI Hybrid Mode
         self.engine.indicator_layer = self.indicator_layer
@@ -51,17 +149,279 @@ class SymbolProcessor:
         self.smart_sl = SmartStopLoss()
         self.dynamic_tp = DynamicTakeProfit()
 
+    def apply_config(self, config: Dict[str, Any], indicator_params: Optional[Dict[str, Any]] = None):
+        """
+        Push indicator-related settings to this symbol's stack.
+        `indicator_params` lets a caller updating many processors extract them once.
+        """
+        if self._indicator_update is not None:
+            if indicator_params is None:
+                indicator_params = {key: config.get(key) for key in INDICATOR_CONFIG_KEYS}
+            self._indicator_update(**indicator_params)
+
+    def update(self, tick: Dict[str, Any]):
+        """
+        Single per-tick entry point for the analysis stack.
+        Feeds the engine, syncs MTF RSI on candle close and runs the
+        indicator and structure analyzers.
+
+        Returns:
+            (indicator_data, structure_data)
+        """
+        engine = self.engine
+        indicator_layer = self.indicator_layer
+
+        # 1. Update Engine
+        engine.update_tick(tick["symbol"], tick["quote"], tick["epoch"])
+
+        # 2. Synchronize MTF Indicators (Only on candle close to preserve momentum slope)
+        # The engine queues closed/injected timeframes, so most ticks see an empty deque.
+        closed = engine.closed_timeframes
+        while closed:
+            tf = closed.popleft()
+            indicator_layer.update_rsi_timeframe(tf, engine.get_momentum(tf))
+
+        # 3. Analyze Indicators & Structure
+        indicator_data = indicator_layer.analyze(tick, engine=engine)
+        structure_data = self.market_structure.analyze(tick)
+        return indicator_data, structure_data
+
+    def post(self, fn: Callable, *args):
+        """Queue fn(*args) from the event loop; it runs under compute_lock before the next locked section."""
+        self._inbox.append((fn, args))
+
+    def _enter(self):
+        """Start of a locked section: apply queued mutations. Caller holds compute_lock."""
+        inbox = self._inbox
+        while inbox:
+            fn, args = inbox.popleft()
+            fn(*args)
+
+    def _exit(self):
+        """End of a locked section: republish loop-visible snapshots. Caller holds compute_lock."""
+        candles_1m = self.engine.candles_1m
+        self.last_candle_1m = candles_1m[-1] if candles_1m else None
+
+    def _call_locked(self, fn: Callable, args):
+        with self.compute_lock:
+            self._enter()
+            try:
+                return fn(*args)
+            finally:
+                self._exit()
+
+    async def run_locked(self, fn: Callable, *args):
+        """Run fn(*args) against the stack under compute_lock, in a worker thread."""
+        return await asyncio.to_thread(self._call_locked, fn, args)
+
+    def analyze(self, tick: Dict[str, Any], with_strategy: bool) -> TickAnalysis:
+        """
+        CPU-bound half of the tick pipeline, run via asyncio.to_thread.
+        update() plus, for enabled symbols, market mode, strategy and the
+        engine state the rest of the tick handler reads.
+        """
+        with self.compute_lock:
+            self._enter()
+            try:
+                indicator_data, structure_data = self.update(tick)
+                if not with_strategy:
+                    return TickAnalysis(indicator_data, structure_data)
+
+                engine = self.engine
+                # Reads the engine's deque directly (cached until the next 1m close)
+                market_mode = engine.detect_market_mode(engine.candles_1m)
+                strategy_signal = self.strategy_manager.run_strategy(
+                    self.symbol, tick, engine, structure_data, indicator_data
+                )
+                return TickAnalysis(
+                    indicator_data, structure_data, market_mode, strategy_signal,
+                    volatility_state=engine.get_volatility("1m"),
+                    atr=engine.get_atr("1m"),
+                    spike_counter=engine.memory.get("spike_counter", 0),
+                    strategy_info=self.strategy_manager.get_active_strategy_info(),
+                    rsi_hybrid=self.indicator_layer.get_multi_rsi_confirmation()
+                )
+            finally:
+                self._exit()
+
+    def order_context(self):
+        """(1m volatility, 1m candles copy) for arming a new trade's scalper monitors."""
+        return self.engine.get_volatility("1m"), list(self.engine.candles_1m)
+
+    def ml_inputs(self):
+        """(volatility, regime, indicator_data, rsi_hybrid) for the ML prediction endpoint."""
+        engine = self.engine
+        candles = list(engine.candles_1m)
+        last_candle = candles[-1] if candles else None
+        volatility = engine.get_volatility("1m")
+        regime = engine.detect_market_mode(candles)
+        indicator_data = self.indicator_layer.analyze(last_candle, engine=engine) if last_candle else {}
+        return volatility, regime, indicator_data, self.indicator_layer.get_multi_rsi_confirmation()
+
+def _apply_ohlc(q: deque, c_data: Dict[str, Any], engine: Optional[MasterEngine]):
+    """
+    Fold one OHLC stream update into a symbol's 1h candle deque and sync it to the
+    engine. With an engine it runs under that processor's compute_lock: the deque's
+    dicts are shared with the engine once injected.
+    """
+    epoch = int(c_data['open_time'])
+    if q and q[-1]['epoch'] == epoch:
+        # Same hour (every streamed tick): update the live candle in place
+        candle = q[-1]
+        candle['open'] = float(c_data['open'])
+        candle['high'] = float(c_data['high'])
+        candle['low'] = float(c_data['low'])
+        candle['close'] = float(c_data['close'])
+        # The engine's deque already holds this very dict from the last injection
+        if engine is None or (engine.candles_1h and engine.candles_1h[-1] is candle):
+            return
+    else:
+        q.append({
+            "open": float(c_data['open']),
+            "high": float(c_data['high']),
+            "low": float(c_data['low']),
+            "close": float(c_data['close']),
+            "epoch": epoch
+        })
+    
+    # Sync with Engine (new hour, or first sight of this symbol's processor)
+    if engine is not None:
+        engine.inject_external_candles("1h", list(q))
+
+# Contract types that represent a long ('buy') position; everything else is 'sell'
+_BUY_SIDE_RE = re.compile(r"CALL|MULTUP|ACCU|BUY")
+
+# Exact Deriv contract_type -> side. Seeded with the common types; any other type
+# (CALLE, CALLSPREAD, ...) is classified by the pattern once and memoized.
+CONTRACT_SIDE: Dict[str, str] = {
+    "CALL": "buy", "MULTUP": "buy", "ACCU": "buy",
+    "PUT": "sell", "MULTDOWN": "sell",
+}
+
+def _position_side(contract_type: str) -> str:
+    """Map a Deriv contract type to the dashboard's 'buy'/'sell' side."""
+    side = CONTRACT_SIDE.get(contract_type)
+    if side is None:
+        side = CONTRACT_SIDE[contract_type] = 'buy' if _BUY_SIDE_RE.search(contract_type) else 'sell'
+    return side
+
+# Price field fallbacks, in priority order.
+# Live proposal_open_contract updates (buy_price is the STAKE, never a price).
+ENTRY_KEYS = ('entry_tick', 'entry_spot', 'current_spot')
+CURRENT_KEYS = ('current_spot', 'bid_price')
+EXIT_KEYS = ('exit_tick', 'sell_spot', 'current_spot')
+# Initial portfolio rows carry no spot history, so buy_price is the last resort.
+PORTFOLIO_ENTRY_KEYS = ('entry_tick', 'entry_spot', 'buy_price')
+PORTFOLIO_CURRENT_KEYS = ('bid_price', 'current_spot')
+
+@functools.lru_cache(maxsize=2048)
+def _purchase_time_iso(purchase_time: int) -> str:
+    """ISO open time for a contract's purchase epoch (stable per contract, so cached)."""
+    return datetime.fromtimestamp(purchase_time).isoformat()
+
+@functools.lru_cache(maxsize=4096)
+def _epoch_hhmm(epoch: int) -> str:
+    """Chart label for a candle epoch; chart polling re-requests mostly the same candles."""
+    return datetime.fromtimestamp(epoch).strftime('%H:%M')
+
+# Terminal proposal_open_contract statuses
+_SETTLED_STATUSES = frozenset(('won', 'lost'))
+
+def _level(value) -> float:
+    """Optional price level from contract metadata as a float, NaN when unset."""
+    return float(value) if value is not None else np.nan
+
+def _first_float(d: dict, keys: tuple) -> float:
+    """First non-empty, non-zero value among `keys` as a float (0.0 if none)."""
+    for key in keys:
+        v = d.get(key)
+        if v:
+            return float(v)
+    return 0.0
+
 # Deriv API Endpoint
 DERIV_WS_BASE_URL = "wss://ws.derivws.com/websockets/v3"
 
+# User-facing symbol aliases -> Deriv API symbols (anything not listed is already an API symbol)
+SYMBOL_MAP = {
+    "BOOM300": "BOOM300N", "BOOM_300": "BOOM300N",
+    "CRASH300": "CRASH300N", "CRASH_300": "CRASH300N", "CRASH300S": "CRASH300N",
+    "R10": "R_10", "R25": "R_25", "R50": "R_50", "R75": "R_75", "R100": "R_100",
+}
+
 logger = logging.getLogger("deriv_connector")
 
+# Seconds to wait for a req_id-matched response before giving up
+REQUEST_TIMEOUT_SECONDS = 60.0
+
+# Pre-rendered 1h candle subscription: (symbol, req_id) are the only per-request fields.
+# A text frame, so formatted as str; symbols are our own alphanumeric codes (no escaping).
+CANDLES_1H_SUB_TEMPLATE = (
+    '{"ticks_history":"%s","style":"candles","granularity":3600,'
+    '"end":"latest","count":20,"subscribe":1,"req_id":%d}'
+)
+
+# How long a contracts_for response stays valid (available contracts change on a minutes scale)
+CONTRACTS_CACHE_TTL = 300
+
+# Upper bound on cached contracts_for responses (least recently refreshed evicted first)
+MAX_CONTRACTS_CACHE_ENTRIES = 64
+
+# Coalescing window for 'positions' broadcasts driven by portfolio/contract streams
+POSITIONS_BROADCAST_INTERVAL = 0.05
+
+# Per-symbol tick buffer size between the listener and that symbol's consumer
+TICK_RING_CAPACITY = 4096
+
+# How long a computed ML prediction is served to pollers (while the 1m candle is unchanged)
+ML_PREDICTION_TTL = 1.0
+
+# Symbol switches landing within this window share one tick re-subscription
+SUBSCRIBE_DEBOUNCE_SECONDS = 0.1
+
+# How many settled contract IDs to remember for de-duplicating session stats
+MAX_PROCESSED_CONTRACTS = 1000
+
+# How many contracts to keep local SL/TP metadata for (normally freed when the contract settles)
+MAX_CONTRACT_METADATA = 1000
+
+def _expire_request(future: asyncio.Future):
+    """Timer callback: fail a pending request future that never got a response."""
+    if not future.done():
+        future.set_exception(asyncio.TimeoutError())
+
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 class DerivConnector:
+    # Fixed attribute layout: every attribute assigned on the connector must be listed here
+    __slots__ = (
+        # Connection & auth
+        "token", "app_id", "ws", "is_connected", "is_authorized", "listen_task",
+        "active_requests", "req_id_counter", "_dispatch", "_pending_sells",
+        "_tick_rings", "_tick_consumers", "_event_queue", "_event_task",
+        "_closing_contracts", "_exit_tasks",
+        # Subscriptions
+        "active_symbols", "enabled_symbols", "_enabled_symbol_set",
+        "_tick_sub_frames", "_balance_frame", "_portfolio_frame", "_contracts_frame",
+        "_subscribe_dirty", "_subscribe_task",
+        # Account & positions
+        "active_account_id", "available_accounts", "account_tokens", "current_account",
+        "start_balance", "open_positions", "processed_contracts", "contract_metadata",
+        "contract_metadata_by_symbol",
+        "session_stats", "_positions_dirty", "_positions_task", "_last_positions_frame",
+        # Processing
+        "processors", "tick_count", "candles_1h", "contracts_cache", "_contracts_inflight", "last_skipped_data",
+        "_ml_cache",
+        "lot_calculator", "risk_guard", "cooldown_manager", "trade_lock", "symbol_locks",
+        # Config
+        "default_config", "_default_config_json", "_risk_guard_update",
+        # Formatting caches
+        "_log_id_prefix", "_log_seq", "_tick_iso_cache", "_now_iso_cache",
+    )
+
     def __init__(self, token: str = None, app_id: str = "118882"):
         real_token = os.getenv("DERIV_REAL_TOKEN")
         real_app_id = os.getenv("DERIV_REAL_APP_ID", "118882")
@@ -91,7 +451,26 @@ class DerivConnector:
             # Gold
             "WLDXAU"
         ]
-        self.active_requests: Dict[str, asyncio.Future] = {} 
+        self.active_symbols = [sys.intern(s) for s in self.active_symbols]
+        
+        # Pre-serialized subscription frames (fixed for the lifetime of the session)
+        self._tick_sub_frames: Dict[str, str] = {
+            symbol: json_dumps({"ticks": symbol, "subscribe": 1}) for symbol in self.active_symbols
+        }
+        self._balance_frame = json_dumps({"balance": 1, "subscribe": 1})
+        # portfolio: 1 gives us the initial list of open positions and future updates
+        self._portfolio_frame = json_dumps({"portfolio": 1})
+        # proposal_open_contract: 1 without contract_id subscribes to ALL open contracts
+        self._contracts_frame = json_dumps({"proposal_open_contract": 1, "subscribe": 1})
+        # Debounced tick re-subscription for bursts of symbol switches
+        self._subscribe_dirty = False
+        self._subscribe_task: Optional[asyncio.Task] = None
+        self.active_requests: Dict[int, asyncio.Future] = {} 
+        # Fire-and-forget local-exit sells awaiting their ack: {req_id: contract_id}
+        self._pending_sells: Dict[int, str] = {}
+        # Contracts with a local SL/TP close in flight, and the tasks sending those sells
+        self._closing_contracts: set = set()
+        self._exit_tasks: set = set()
         self.listen_task: Optional[asyncio.Task] = None
         
         self.active_account_id = None
@@ -111,19 +490,29 @@ class DerivConnector:
             pass
 
         self.current_account: Dict = {}
-        self.open_positions: List[Dict] = []
+        # Open positions keyed by contract ID (broadcast as a list of values)
+        self.open_positions: Dict[str, Position] = {}
+        # Set when open_positions changed; a background task coalesces these into one broadcast
+        self._positions_dirty = asyncio.Event()
+        self._positions_task: Optional[asyncio.Task] = None
+        # (subscriber epoch, frame) of the last positions broadcast, to drop unchanged resends
+        self._last_positions_frame: Optional[tuple] = None
         
         self.req_id_counter = 100 
         self.tick_count = 0
-        self.processed_contracts = set()
+        
+        # Log IDs only need to be unique per session: random prefix + counter instead of a uuid4 per event
+        self._log_id_prefix = uuid.uuid4().hex[:8]
+        self._log_seq = itertools.count(1)
+        # (epoch, iso) of the last formatted tick timestamp; ticks for all symbols share the same second
+        self._tick_iso_cache = (None, "")
+        # Same idea for wall-clock stamps on throttled per-tick events
+        self._now_iso_cache = (None, "")
+        # Settled contracts already counted in session stats (insertion-ordered, capped at MAX_PROCESSED_CONTRACTS)
+        self.processed_contracts: "OrderedDict[str, None]" = OrderedDict()
         
         # Session Stats
-        self.session_stats = {
-            "pnl": 0.0,
-            "trades": 0,
-            "wins": 0,
-            "losses": 0
-        }
+        self.session_stats = SessionStats()
 
         # Symbol Processing Units
         self.processors: Dict[str, SymbolProcessor] = {}
@@ -143,27 +532,35 @@ class DerivConnector:
             # Gold
             "WLDXAU"
         ]  # All pairs enabled
+        self.enabled_symbols = [sys.intern(s) for s in self.enabled_symbols]
+        # Set mirror of enabled_symbols for the per-tick membership check
+        self._enabled_symbol_set = set(self.enabled_symbols)
         
         # Risk & Shared Services (Shared across all pairs)
         self.lot_calculator = WeightedLotCalculator()
         self.risk_guard = RiskGuard()
+        # Resolved once; apply_config_updates runs on every settings push
+        self._risk_guard_update = getattr(self.risk_guard, 'update_params', None)
         self.cooldown_manager = CooldownManager(default_cooldown_seconds=30)
         
-        # Local Contract Memory (SL/TP Tracking)
-        # Local Contract Memory (SL/TP Tracking)
-        self.contract_metadata: Dict[str, Dict] = {}
+        # Local Contract Memory (SL/TP Tracking), insertion-ordered and capped at MAX_CONTRACT_METADATA
+        self.contract_metadata: "OrderedDict[str, Dict]" = OrderedDict()
+        # Same entries indexed {symbol: {cid: meta}} so a tick only walks its own symbol's contracts
+        self.contract_metadata_by_symbol: Dict[str, Dict[str, Dict]] = defaultdict(dict)
         
         # Multi-Timeframe Storage (1H Candles)
         self.candles_1h: Dict[str, deque] = {}
         
         # Performance & Rate Limit Guards
-        self.contracts_cache: Dict[str, Dict] = {} # {symbol: {"data": [...], "timestamp": float}}
+        # {symbol: {"data": [...], "timestamp": monotonic}}, refresh-ordered and capped at MAX_CONTRACTS_CACHE_ENTRIES
+        self.contracts_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._contracts_inflight: Dict[str, asyncio.Task] = {} # {symbol: pending contracts_for refresh}
         self.trade_lock = asyncio.Lock()
         self.symbol_locks = defaultdict(asyncio.Lock)
         
         # Initialize C++ Engine with new JSON config
         try:
-            EngineWrapper.init_engine(json.dumps({
+            EngineWrapper.init_engine(json_dumps({
                 "cooldown_seconds": 60,
                 "max_active_trades": 10
             }))
@@ -171,6 +568,12 @@ class DerivConnector:
         except Exception as e:
             logger.error(f"Failed to init C++ Engine: {e}")
 
+        # Compile indicator kernels up front so the first live tick isn't penalized
+        try:
+            warm_up_indicator_kernels()
+        except Exception as e:
+            logger.error(f"Failed to warm up indicator kernels: {e}")
+
         # Default Config
         self.default_config = {
             "grid_size": 10,
@@ -191,31 +594,82 @@ class DerivConnector:
             "max_daily_loss": 5.0,
             "max_sl_hits": 3
         }
-        self.last_skipped_data = {}
+        # Skip-broadcast throttle per symbol: (hash(reason), last broadcast time)
+        self.last_skipped_data: Dict[str, tuple] = {}
+        # symbol -> (computed_at, 1m candle time, prediction) for get_latest_ml_prediction
+        self._ml_cache: Dict[str, tuple] = {}
+        
+        # Stream routing keyed by Deriv msg_type (payload lives under the same key);
+        # listen() makes one lookup per message and calls the entry with the payload.
+        self._dispatch: Dict[str, Callable[[Any], None]] = {
+            'tick': self._enqueue_tick,
+            'ohlc': self.handle_ohlc,
+            'balance': functools.partial(self._enqueue_event, self.handle_balance),
+            'portfolio': functools.partial(self._enqueue_event, self.handle_portfolio),
+            'proposal_open_contract': functools.partial(self._enqueue_event, self.handle_position_update),
+        }
+        # Ticks go to one ring + consumer task per symbol (in order, no Task per tick);
+        # account/contract events share a single queue + consumer.
+        self._tick_rings: Dict[str, TickRing] = {}
+        self._tick_consumers: Dict[str, asyncio.Task] = {}
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._event_task: Optional[asyncio.Task] = None
         
         # Apply initial config
         self.apply_config_updates(self.default_config)
 
+    def _next_log_id(self) -> str:
+        return f"{self._log_id_prefix}-{next(self._log_seq)}"
+
+    def _emit_log(self, message: str, level: str, source: str, timestamp: Optional[str] = None):
+        """Build a dashboard log entry in one place; returns the broadcast coroutine."""
+        return stream_manager.broadcast_log({
+            "id": self._next_log_id(),
+            "timestamp": timestamp or self._now_timestamp(),
+            "message": message,
+            "level": level,
+            "source": source
+        })
+
+    def _tick_timestamp(self, epoch: int) -> str:
+        """ISO timestamp for a tick epoch, reusing the last result within the same second."""
+        cached_epoch, cached_iso = self._tick_iso_cache
+        if epoch == cached_epoch:
+            return cached_iso
+        iso = datetime.fromtimestamp(epoch).isoformat()
+        self._tick_iso_cache = (epoch, iso)
+        return iso
+
+    def _now_timestamp(self) -> str:
+        """Second-resolution ISO wall-clock time, formatted at most once per second."""
+        sec = int(time.time())
+        cached_sec, cached_iso = self._now_iso_cache
+        if sec == cached_sec:
+            return cached_iso
+        iso = datetime.fromtimestamp(sec).isoformat()
+        self._now_iso_cache = (sec, iso)
+        return iso
+
     def apply_config_updates(self, config: Dict[str, Any]):
         """Apply dynamic configuration updates to sub-services."""
         # Update internal defaults for future processors
         self.default_config.update(config)
+        # Serialized once per config change; reused for every engine bootstrap on reconnect
+        self._default_config_json = json_dumps(self.default_config)
             
         # Update Risk Guard
-        if hasattr(self.risk_guard, 'update_params'):
-            self.risk_guard.update_params(
+        if self._risk_guard_update is not None:
+            self._risk_guard_update(
                 max_daily_loss_percent = config.get("max_daily_loss"),
                 max_sl_hits = config.get("max_sl_hits"),
                 max_active_trades = config.get("max_open_trades")
             )
             
-        # Update all active processors
-        for symbol, p in self.processors.items():
-            if hasattr(p.indicator_layer, 'update_params'):
-                p.indicator_layer.update_params(
-                    rsi_oversold = config.get("rsi_oversold"),
-                    rsi_overbought = config.get("rsi_overbought")
-                )
+        # Update all active processors (indicator kwargs extracted once for all of them)
+        indicator_params = {key: config.get(key) for key in INDICATOR_CONFIG_KEYS}
+        for p in self.processors.values():
+            # Applied under the processor's lock before its next analysis
+            p.post(p.apply_config, config, indicator_params)
             
         logger.info("Dynamic configuration applied to active processors.")
 
@@ -224,8 +678,13 @@ class DerivConnector:
             try:
                 url = f"{DERIV_WS_BASE_URL}?app_id={self.app_id}"
                 logger.info(f"Connecting to {url}")
-                self.ws = await websockets.connect(url)
+                # Deriv frames are small JSON messages: per-message deflate costs more CPU than it saves
+                self.ws = await websockets.connect(url, compression=None)
                 self.is_connected = True
+                # Acks for sells sent on the old socket will never arrive
+                self._pending_sells.clear()
+                # Ticks buffered from the old socket are stale
+                self._stop_tick_consumers()
                 logger.info("Connected to Deriv WebSocket")
                 
                 # Start listener
@@ -255,38 +714,24 @@ class DerivConnector:
             # Small delay to ensure listener is ready
             await asyncio.sleep(0.5)
             
-            await stream_manager.broadcast_log({
-                "id": str(uuid.uuid4()),
-                "timestamp": datetime.now().isoformat(),
-                "message": "Connecting to Deriv API...",
-                "level": "info",
-                "source": "System"
-            })
+            await self._emit_log("Connecting to Deriv API...", "info", "System")
             
             await self.authorize()
             
             # Subscriptions
-            await stream_manager.broadcast_log({
-                "id": str(uuid.uuid4()),
-                "timestamp": datetime.now().isoformat(),
-                "message": "Subscribing to live data feeds...",
-                "level": "info",
-                "source": "System"
-            })
+            await self._emit_log("Subscribing to live data feeds...", "info", "System")
             
             await asyncio.gather(
-                self.subscribe_ticks(),
+                self.subscribe_streams(),
                 self.subscribe_candles_1h(), # MTF Sub
-                self.subscribe_balance(),
-                self.subscribe_portfolio(),
-                self.subscribe_contracts(),
                 return_exceptions=True
             )
             logger.info("Session initialization complete")
             
             # Bootstrap Engine with Default Config
             try:
-                EngineWrapper.init_engine(json.dumps(self.default_config))
+                # EngineWrapper serializes this against an in-flight execute_trade worker thread
+                await asyncio.to_thread(EngineWrapper.init_engine, self._default_config_json)
                 logger.info("Trading Engine Initialized with Default Config")
             except Exception as e:
                 logger.error(f"Failed to initialize trading engine: {e}")
@@ -358,19 +803,11 @@ class DerivConnector:
                             "isActive": acc_id == self.active_account_id
                         })
                 
-                await stream_manager.broadcast_log({
-                    "id": str(uuid.uuid4()),
-                    "timestamp": datetime.now().isoformat(),
-                    "message": msg,
-                    "level": "success",
-                    "source": "Deriv"
-                })
+                await self._emit_log(msg, "success", "Deriv")
 
                 # RE-SUBSCRIBE to critical streams after authorization
                 # because switching tokens resets the session context
-                await self.subscribe_balance()
-                await self.subscribe_ticks()
-                await self.subscribe_portfolio()
+                await self.subscribe_streams(include_contracts=False)
                 
                 # Broadcast updated account list to frontend immediately
                 await stream_manager.broadcast_event('accounts', self.available_accounts)
@@ -400,53 +837,84 @@ class DerivConnector:
              )
 
 
+    def _tick_sub_frame(self, symbol: str) -> str:
+        """Returns the cached tick subscription frame, building it for symbols added at runtime."""
+        frame = self._tick_sub_frames.get(symbol)
+        if frame is None:
+            frame = json_dumps({"ticks": symbol, "subscribe": 1})
+            self._tick_sub_frames[symbol] = frame
+        return frame
+
+    async def subscribe_streams(self, include_contracts: bool = True):
+        """
+        Pipelines the tick, balance, portfolio and contract subscriptions in one burst.
+        Frames are written back-to-back with no work in between so they coalesce
+        into as few TCP segments as possible.
+        """
+        if not self.ws: return
+        frames = [self._tick_sub_frame(symbol) for symbol in self.active_symbols]
+        frames.append(self._balance_frame)
+        frames.append(self._portfolio_frame)
+        if include_contracts:
+            frames.append(self._contracts_frame)
+        
+        for frame in frames:
+            await self.ws.send(frame)
+        logger.info(f"Subscribed to {len(self.active_symbols)} tick feeds, Balance, Portfolio" + (" and Contract Updates" if include_contracts else ""))
+
     async def subscribe_ticks(self):
         if not self.ws: return
-        for symbol in self.active_symbols:
-            req = {
-                "ticks": symbol,
-                "subscribe": 1
-            }
-            await self.ws.send(json.dumps(req))
-            logger.info(f"Subscribed to tick feed: {symbol}")
+        # Build every frame first so the sends go out back-to-back
+        frames = [self._tick_sub_frame(symbol) for symbol in self.active_symbols]
+        for frame in frames:
+            await self.ws.send(frame)
+        logger.info(f"Subscribed to tick feeds: {', '.join(self.active_symbols)}")
+
+    def _schedule_subscribe(self):
+        """Request a tick re-subscription; a burst of requests is applied once."""
+        self._subscribe_dirty = True
+        if self._subscribe_task is None or self._subscribe_task.done():
+            self._subscribe_task = asyncio.create_task(self._debounced_subscribe())
+
+    async def _debounced_subscribe(self):
+        # Loops while requests keep arriving, so one landing mid-subscribe isn't lost
+        while self._subscribe_dirty:
+            await asyncio.sleep(SUBSCRIBE_DEBOUNCE_SECONDS)
+            self._subscribe_dirty = False
+            try:
+                await self.subscribe_ticks()
+            except Exception as e:
+                logger.error(f"Tick re-subscription failed: {e}")
 
     async def subscribe_balance(self):
         if not self.ws: return
-        req = {"balance": 1, "subscribe": 1}
-        await self.ws.send(json.dumps(req))
+        await self.ws.send(self._balance_frame)
         logger.info("Subscribed to Balance updates")
 
     async def subscribe_portfolio(self):
         if not self.ws: return
-        # portfolio: 1 gives us the initial list of open positions and future updates
-        req = {"portfolio": 1} 
-        await self.ws.send(json.dumps(req))
+        await self.ws.send(self._portfolio_frame)
         logger.info("Subscribed to Portfolio (Open Positions)")
 
     async def subscribe_contracts(self):
         if not self.ws: return
-        # proposal_open_contract: 1 without contract_id subscribes to ALL open contracts
-        req = {"proposal_open_contract": 1, "subscribe": 1}
-        await self.ws.send(json.dumps(req))
+        await self.ws.send(self._contracts_frame)
         logger.info("Subscribed to global Contract Updates")
 
     async def subscribe_candles_1h(self):
         """Subscribe to 1-Hour candles for active symbols for MTF analysis."""
+        requests = []
         for symbol in self.active_symbols:
             # Initialize storage
             if symbol not in self.candles_1h:
                 self.candles_1h[symbol] = deque(maxlen=20)
                 
             logger.info(f"Subscribing to 1H candles: {symbol}")
-            req = {
-                "ticks_history": symbol,
-                "style": "candles",
-                "granularity": 3600, # 1 Hour
-                "end": "latest",
-                "count": 20,
-                "subscribe": 1
-            }
-            await self.send_request(req)
+            self.req_id_counter += 1
+            req_id = self.req_id_counter
+            requests.append(self._send_frame(req_id, CANDLES_1H_SUB_TEMPLATE % (symbol, req_id)))
+        # Pipelined: all requests are written before any response is awaited (one RTT, not N)
+        await asyncio.gather(*requests)
 
     async def get_active_symbols(self):
         """Fetches active symbols from Deriv if not already cached/set."""
@@ -479,116 +947,122 @@ class DerivConnector:
             "end": "latest"
         }
         resp = await self.send_request(req)
-        if 'candles' in resp:
-            return [
-                {
-                    "time": datetime.fromtimestamp(c['epoch']).strftime('%H:%M'),
-                    "epoch": c['epoch'],
-                    "open": float(c['open']),
-                    "high": float(c['high']),
-                    "low": float(c['low']),
-                    "close": float(c['close']),
-                    "volume": 0 # Deriv doesn't always provide volume for all indices
-                }
-                for c in resp['candles']
-            ]
-        return []
+        candles = resp.get('candles')
+        if not candles:
+            return []
+        # One C-level conversion for the whole OHLC block instead of four float() calls per candle
+        ohlc = np.array(
+            [(c['open'], c['high'], c['low'], c['close']) for c in candles], dtype=np.float64
+        ).tolist()
+        return [
+            {
+                "time": _epoch_hhmm(c['epoch']),
+                "epoch": c['epoch'],
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": cl,
+                "volume": 0 # Deriv doesn't always provide volume for all indices
+            }
+            for c, (o, h, l, cl) in zip(candles, ohlc)
+        ]
 
     async def send_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        if not self.ws or not self.is_connected:
-            raise ConnectionError("WebSocket not connected")
-
         if 'req_id' not in request:
             self.req_id_counter += 1
             request['req_id'] = self.req_id_counter
             
-        req_id = request['req_id']
-        future = asyncio.get_running_loop().create_future()
+        return await self._send_frame(int(request['req_id']), json_dumps(request))
+
+    async def _send_frame(self, req_id: int, frame: str) -> Dict[str, Any]:
+        """send_request() for an already-serialized frame carrying `req_id`."""
+        if not self.ws or not self.is_connected:
+            raise ConnectionError("WebSocket not connected")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # listen() pops the entry when the response arrives
         self.active_requests[req_id] = future
+        # One timer handle per request; wait_for() would add a waiter future and callbacks on top
+        timer = loop.call_later(REQUEST_TIMEOUT_SECONDS, _expire_request, future)
         
         try:
-            logger.info(f">>> SENDING: {request}")
-            await self.ws.send(json.dumps(request))
-            response = await asyncio.wait_for(future, timeout=60.0) 
-            logger.info(f">>> GOT RESPONSE FOR {req_id}")
+            # Per-message traces are DEBUG with deferred %-formatting (free when disabled)
+            logger.debug(">>> SENDING: %s", frame)
+            await self.ws.send(frame)
+            response = await future
+            logger.debug(">>> GOT RESPONSE FOR %s", req_id)
             return response
         except asyncio.TimeoutError:
             logger.error(f"Request {req_id} timed out")
             return {"error": {"code": "Timeout", "message": "Request timed out"}}
         finally:
-            self.active_requests.pop(req_id, None)
+            timer.cancel()
+            # Drop our entry on timeout/failure/cancellation (no-op if listen() already popped it)
+            if self.active_requests.get(req_id) is future:
+                del self.active_requests[req_id]
+
+    @staticmethod
+    def _raw_recv(ws):
+        """
+        ws.recv, returning the raw frame bytes where the client supports it
+        (websockets' asyncio API, recv(decode=False)): orjson parses bytes directly,
+        so the UTF-8 decode to str is skipped. Older clients keep plain recv().
+        """
+        recv = ws.recv
+        try:
+            if "decode" in inspect.signature(recv).parameters:
+                return functools.partial(recv, decode=False)
+        except (TypeError, ValueError):
+            pass
+        return recv
 
     async def listen(self):
         logger.info("Listener Process Started")
+        ws = recv = None
         while self.is_connected and self.ws:
             try:
-                message = await self.ws.recv()
-                logger.info(f"RECVD: {message}")
-                data = json.loads(message)
+                if self.ws is not ws:
+                    ws = self.ws
+                    recv = self._raw_recv(ws)
+                message = await recv()
+                # Checked once per frame; production runs at INFO, so no trace work happens
+                debug = logger.isEnabledFor(logging.DEBUG)
+                if debug:
+                    logger.debug("RECVD: %s", message)
+                data = json_loads(message)
+                msg_type = data.get('msg_type')
                 # Check for req_id match in both top-level and echo_req
                 req_id = data.get('req_id')
                 if not req_id and 'echo_req' in data:
                     req_id = data['echo_req'].get('req_id')
+                # Deriv echoes back the int we sent; only foreign payloads need coercion
+                if req_id is not None and type(req_id) is not int:
+                    req_id = int(req_id) if str(req_id).isdigit() else None
                 
                 # logger.debug is enough for production
-                if data.get('msg_type') not in ['tick', 'ohlc']:
-                    logger.debug(f"Deriv WebSocket Received: {data.get('msg_type')} (req_id: {req_id})")
+                if debug and msg_type != 'tick' and msg_type != 'ohlc':
+                    logger.debug("Deriv WebSocket Received: %s (req_id: %s)", msg_type, req_id)
                 
-                # Try matching by req_id
+                # Match by req_id (always stored as int by send_request)
                 if req_id is not None:
-                    # Try as provided type, then as int, then as string
-                    match_found = False
-                    keys_to_try = [req_id]
-                    try:
-                        keys_to_try.append(int(req_id))
-                    except: pass
-                    keys_to_try.append(str(req_id))
-                    
-                    for k in keys_to_try:
-                        if k in self.active_requests:
-                            logger.info(f"MATCHED req_id {k}")
-                            future = self.active_requests[k]
-                            if not future.done():
-                                future.set_result(data)
-                            match_found = True
-                            break
-                    
-                    if not match_found and data.get('msg_type') not in ['tick', 'ohlc']:
+                    future = self.active_requests.pop(req_id, None)
+                    if future is not None:
+                        if debug:
+                            logger.debug("MATCHED req_id %s", req_id)
+                        if not future.done():
+                            future.set_result(data)
+                    elif req_id in self._pending_sells:
+                        self._handle_sell_ack(self._pending_sells.pop(req_id), data)
+                    elif msg_type != 'tick' and msg_type != 'ohlc':
                         logger.warning(f"req_id {req_id} NOT found in active_requests: {list(self.active_requests.keys())}")
                 
-                if 'tick' in data:
-                    asyncio.create_task(self.handle_tick(data['tick']))
-                
-                if 'ohlc' in data:
-                    # Async update of 1h candles
-                    symbol = data['ohlc']['symbol']
-                    if symbol in self.candles_1h:
-                        c_data = data['ohlc']
-                        candle = {
-                            "open": float(c_data['open']),
-                            "high": float(c_data['high']),
-                            "low": float(c_data['low']),
-                            "close": float(c_data['close']),
-                            "epoch": int(c_data['open_time'])
-                        }
-                        # Deque update logic
-                        q = self.candles_1h[symbol]
-                        if not q: q.append(candle)
-                        elif q[-1]['epoch'] == candle['epoch']: q[-1] = candle
-                        else: q.append(candle)
-                        
-                        # Sync with Engine
-                        if symbol in self.processors:
-                             self.processors[symbol].engine.inject_external_candles("1h", list(q))
-                
-                if 'balance' in data:
-                     asyncio.create_task(self.handle_balance(data['balance']))
-
-                if 'portfolio' in data:
-                    asyncio.create_task(self.handle_portfolio(data['portfolio']))
-
-                if 'proposal_open_contract' in data:
-                    asyncio.create_task(self.handle_position_update(data['proposal_open_contract']))
+                # Dispatch stream payloads: each message carries exactly one payload keyed by its msg_type
+                route = self._dispatch.get(msg_type)
+                if route is not None:
+                    payload = data.get(msg_type)
+                    if payload is not None:
+                        route(payload)
                     
             except websockets.ConnectionClosed:
                 logger.warning("Deriv WebSocket connection closed. Attempting reconnect...")
@@ -603,23 +1077,76 @@ class DerivConnector:
                     asyncio.create_task(self.connect())
                     break
 
+    def _enqueue_tick(self, tick):
+        ring = self._tick_rings.get(tick['symbol'])
+        if ring is None:
+            ring = self._tick_rings[tick['symbol']] = TickRing(TICK_RING_CAPACITY)
+            self._tick_consumers[tick['symbol']] = asyncio.create_task(self._tick_consumer(ring))
+        ring.push(tick)
+
+    def _stop_tick_consumers(self):
+        """Cancel every symbol's tick consumer and drop its ring (recreated on the next tick)."""
+        for task in self._tick_consumers.values():
+            task.cancel()
+        self._tick_consumers.clear()
+        self._tick_rings.clear()
+
+    async def _tick_consumer(self, ring: TickRing):
+        """Processes one symbol's ticks strictly in arrival order."""
+        while True:
+            tick = await ring.pop()
+            try:
+                await self.handle_tick(tick)
+            except Exception as e:
+                logger.error(f"Error processing tick for {tick.get('symbol')}: {e}", exc_info=True)
+
+    def _enqueue_event(self, handler, payload):
+        if self._event_task is None or self._event_task.done():
+            self._event_queue = asyncio.Queue()
+            self._event_task = asyncio.create_task(self._event_consumer(self._event_queue))
+        self._event_queue.put_nowait((handler, payload))
+
+    async def _event_consumer(self, queue: asyncio.Queue):
+        """Runs balance/portfolio/contract handlers in arrival order."""
+        while True:
+            handler, payload = await queue.get()
+            try:
+                await handler(payload)
+            except Exception as e:
+                logger.error(f"Error in {handler.__name__}: {e}", exc_info=True)
+
+    def handle_ohlc(self, c_data):
+        """Update of 1h candles from the OHLC stream."""
+        q = self.candles_1h.get(c_data['symbol'])
+        if q is None:
+            return
+        p = self.processors.get(c_data['symbol'])
+        if p is None:
+            _apply_ohlc(q, c_data, None)
+        else:
+            # From here on the deque is only touched under the processor's lock
+            p.post(_apply_ohlc, q, c_data, p.engine)
+
     async def handle_tick(self, tick):
-        symbol = tick['symbol']
+        # Intern so dict/set lookups against our own symbol keys hit the identity fast-path
+        symbol = sys.intern(tick['symbol'])
         bid = tick['quote']
+        # The JSON parser already yields floats; only whole-number quotes arrive as int/str
+        price = bid if bid.__class__ is float else float(bid)
         epoch = tick['epoch']
         
-        tick_data = {
-            "symbol": symbol,
-            "bid": float(bid),
-            "ask": float(bid), # Simplified for synthetic
-            "timestamp": datetime.fromtimestamp(epoch).isoformat(),
-        }
-        
-        # Broadcast ALL ticks
-        await stream_manager.broadcast_tick(tick_data)
+        # Broadcast ALL ticks (coalesced into batched frames by the stream manager).
+        # Skip building the payload entirely when no dashboard is listening.
+        if stream_manager.has_subscribers:
+            stream_manager.enqueue_tick({
+                "symbol": symbol,
+                "bid": price,
+                "ask": price, # Simplified for synthetic
+                "timestamp": self._tick_timestamp(epoch),
+            })
         
         # Monitor positions
-        await self.monitor_positions_for_sl_tp(float(bid), symbol)
+        await self.monitor_positions_for_sl_tp(price, symbol)
         
         # Get Processor (Universal: We process ALL symbols for ML Insights)
         if symbol not in self.processors:
@@ -628,82 +1155,59 @@ class DerivConnector:
         p = self.processors[symbol]
         p.tick_count += 1
 
-        # 1. Update Engine (Universal)
-        p.engine.update_tick(symbol, float(bid), epoch)
+        # 1-3. Engine, MTF sync and indicator/structure analysis (Universal for ML Predictions)
+        tick_for_algo = p.tick
+        tick_for_algo["quote"] = price
+        ask_px = tick.get('ask', price)
+        bid_px = tick.get('bid', price)
+        tick_for_algo["high"] = ask_px if ask_px.__class__ is float else float(ask_px)
+        tick_for_algo["low"] = bid_px if bid_px.__class__ is float else float(bid_px)
+        tick_for_algo["open"] = price
+        tick_for_algo["epoch"] = epoch
 
-        # 2. Synchronize MTF Indicators (Only on candle close to preserve momentum slope)
-        current_counts = {
-            "1m": len(p.engine.candles_1m),
-            "5m": len(p.engine.candles_5m),
-            "15m": len(p.engine.candles_15m),
-            "1h": len(p.engine.candles_1h)
-        }
-        
-        for tf, count in current_counts.items():
-            if count > p.candle_counts[tf]:
-                rsi_val = p.engine.get_momentum(tf)
-                p.indicator_layer.update_rsi_timeframe(tf, rsi_val)
-                p.candle_counts[tf] = count
-
-        # 3. Analyze Indicators (Universal for ML Predictions)
-        tick_for_algo = {
-            "symbol": symbol,
-            "quote": float(bid),
-            "high": float(tick.get('ask', bid)),
-            "low": float(tick.get('bid', bid)),
-            "open": float(bid),
-            "epoch": epoch
-        }
-        indicator_data = p.indicator_layer.analyze(tick_for_algo, engine=p.engine)
-        structure_data = p.market_structure.analyze(tick_for_algo)
+        # 3.5 Execution Lock (Prevent rapid-fire identical signals). Only this consumer
+        # acquires it, so "unlocked" here still holds once the analysis returns.
+        lock = self.symbol_locks[symbol] if symbol in self._enabled_symbol_set else None
+        with_strategy = lock is not None and not lock.locked()
+
+        # 4. Analysis + strategy in a worker thread so the loop keeps draining the socket
+        # and other symbols' consumers while this one computes.
+        analysis = await asyncio.to_thread(p.analyze, tick_for_algo, with_strategy)
 
-        if symbol not in self.enabled_symbols:
+        if not with_strategy:
             return
+        market_mode = analysis.market_mode
+        strategy_signal = analysis.strategy_signal
 
         try:
-            # 3.5 Execution Lock (Prevent rapid-fire identical signals)
-            lock = self.symbol_locks[symbol]
-            if lock.locked():
-                # logger.debug(f"Execution Lock Active for {symbol} - Skipping tick")
-                return
-            
-            async with lock:
-                # 4. Strategy Analysis
-                candles_1m_list = list(p.engine.candles_1m)
-                market_mode = p.engine.detect_market_mode(candles_1m_list)
-                
-                # Run strategy
-                strategy_signal = p.strategy_manager.run_strategy(
-                    symbol,
-                    tick_for_algo,
-                    p.engine,
-                    structure_data,
-                    indicator_data
-                )
-                
+            # Held for this tick, or handed to the order task so later ticks keep flowing
+            await lock.acquire()
+            order_task = None
+            try:
                 # 4. Final Validation & Execution
                 action = strategy_signal.get('action') if strategy_signal else None
                 final_confidence = strategy_signal.get('confidence', 0) if strategy_signal else 0
-                volatility_state = p.engine.get_volatility("1m")
+                volatility_state = analysis.volatility_state
                 
                 # Broadcast Skip if reason provided (Optimized: Throttled)
                 if strategy_signal and not action and strategy_signal.get('reason'):
                     now = time.time()
-                    last_data = self.last_skipped_data.get(symbol, {"reason": "", "timestamp": 0})
+                    reason_hash = hash(strategy_signal['reason'])
+                    last_hash, last_ts = self.last_skipped_data.get(symbol, (0, 0.0))
                     
                     # Only broadcast if reason changed OR 10 seconds passed
-                    if strategy_signal['reason'] != last_data['reason'] or (now - last_data['timestamp']) > 10.0:
+                    if reason_hash != last_hash or (now - last_ts) > 10.0:
                         await stream_manager.broadcast_skipped_signal({
                             "tick_count": p.tick_count,
                             "reason": strategy_signal['reason'],
                             "symbol": symbol,
-                            "atr": p.engine.get_atr("1m"),
+                            "atr": analysis.atr,
                             "confidence": final_confidence,
                             "regime": market_mode,
                             "volatility": volatility_state,
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": self._now_timestamp()
                         })
-                        self.last_skipped_data[symbol] = {"reason": strategy_signal['reason'], "timestamp": now}
+                        self.last_skipped_data[symbol] = (reason_hash, now)
                 
                 if action:
                     # 1. Cooldown Check
@@ -717,7 +1221,7 @@ class DerivConnector:
                             "confidence": final_confidence,
                             "regime": market_mode,
                             "volatility": volatility_state,
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": self._now_timestamp()
                         })
                         return
 
@@ -737,11 +1241,11 @@ class DerivConnector:
                             "tick_count": p.tick_count,
                             "reason": f"Risk Guard: {guard_msg}",
                             "symbol": symbol,
-                            "atr": p.engine.get_atr("1m"),
+                            "atr": analysis.atr,
                             "confidence": final_confidence,
                             "regime": market_mode,
                             "volatility": volatility_state,
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": self._now_timestamp()
                         })
                         return
 
@@ -749,10 +1253,10 @@ class DerivConnector:
                     tp_price = strategy_signal.get('tp')
                     
                     # Convert distances to prices if needed
-                    if sl_price is not None and sl_price < (float(bid) * 0.5):
-                         sl_price = float(bid) - sl_price if action == "BUY" else float(bid) + sl_price
-                    if tp_price is not None and tp_price < (float(bid) * 0.5):
-                         tp_price = float(bid) + tp_price if action == "BUY" else float(bid) - tp_price
+                    if sl_price is not None and sl_price < (price * 0.5):
+                         sl_price = price - sl_price if action == "BUY" else price + sl_price
+                    if tp_price is not None and tp_price < (price * 0.5):
+                         tp_price = price + tp_price if action == "BUY" else price - tp_price
                     
                     # Weighted lot size
                     risk_pct = 0.5
@@ -768,69 +1272,90 @@ class DerivConnector:
                     # Min stake check
                     stake = max(0.35, stake)
 
-                    # Execution
-                    await self.execute_order(symbol, action, stake, sl_price, tp_price, final_confidence, market_mode)
+                    # Execution: order round-trips take seconds, so they run off the tick
+                    # consumer; the task owns the symbol lock until the order completes.
+                    order_task = asyncio.create_task(self._execute_order_locked(
+                        lock, symbol, action, stake, sl_price, tp_price, final_confidence, market_mode
+                    ))
                     
                 # 5. Broadcast Market Status (Always, even if no action)
-                strategy_info = p.strategy_manager.get_active_strategy_info()
+                strategy_info = analysis.strategy_info
                 await stream_manager.broadcast_event('market_status', {
                     "symbol": symbol,
                     "regime": market_mode,
                     "volatility": volatility_state,
                     "active_strategy": strategy_info.get("name", "Unknown"),
                     "tick_count": p.tick_count,
-                    "spike_counter": p.engine.memory.get("spike_counter", 0),
+                    "spike_counter": analysis.spike_counter,
                     "cooldown": int(self.cooldown_manager.get_remaining_seconds())
                 })
 
                 # 6. Check for Scalper Exits
-                rsi_hybrid = p.indicator_layer.get_multi_rsi_confirmation()
+                rsi_hybrid = analysis.rsi_hybrid
                 await self.monitor_positions_for_sl_tp(
-                    float(bid), 
+                    price, 
                     symbol, 
                     momentum_up=rsi_hybrid.get("momentum_up"),
                     momentum_down=rsi_hybrid.get("momentum_down"),
                     slope_value=rsi_hybrid.get("slope_value", 0.0), # Added slope
                     volatility_state=volatility_state
                 )
+            finally:
+                if order_task is None:
+                    lock.release()
                 
         except Exception as e:
-            logger.error(f"Error in handle_tick: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error(f"Error in handle_tick: {e}", exc_info=True)
+
+    async def _execute_order_locked(self, lock: asyncio.Lock, *order_args):
+        try:
+            await self.execute_order(*order_args)
+        finally:
+            lock.release()
 
     async def execute_order(self, symbol, action, stake, sl, tp, confidence, market_mode):
         """Unified order execution with C++ safety check."""
         try:
             # Get processor for strategy info
             p = self.processors.get(symbol)
-            strategy_info = p.strategy_manager.get_active_strategy_info() if p else {"name": "V10_V75_Scalper"}
+            strategy_info = (await p.run_locked(p.strategy_manager.get_active_strategy_info)
+                             if p else {"name": "V10_V75_Scalper"})
             
             # 1. C++ Engine Validation
-            trade_params = {
-                "symbol": symbol,
-                "action": action,
-                "stake": stake,
-                "active_trades": len(self.open_positions)
-            }
-            
-            execution_result_json = EngineWrapper.execute_trade(json.dumps(trade_params))
-            result = json.loads(execution_result_json)
-            
-            if result.get("status") != "approved":
+            # Validation runs off the event loop so ticks keep flowing while C++ works
+            # (EngineWrapper serializes it with every other engine call)
+            active_trades = len(self.open_positions)
+            if EngineWrapper.has_native_trade():
+                approved, reason = await asyncio.to_thread(
+                    EngineWrapper.execute_trade_native, symbol, stake, active_trades)
+            else:
+                # Older libengine.so builds only expose the JSON entry point
+                trade_params = {
+                    "symbol": symbol,
+                    "action": action,
+                    "stake": stake,
+                    "active_trades": active_trades
+                }
+                execution_result_json = await asyncio.to_thread(
+                    EngineWrapper.execute_trade, json_dumps_bytes(trade_params))
+                result = json_loads(execution_result_json)
+                approved = result.get("status") == "approved"
                 reason = result.get('reason', 'C++ Engine Blocked')
+            
+            if not approved:
                 logger.warning(f"C++ Engine Blocked {symbol} {action}: {reason}")
+                atr = await p.run_locked(p.engine.get_atr, "1m") if p else 0
                 
                 # Broadcast for UI transparency
                 await stream_manager.broadcast_skipped_signal({
                     "tick_count": p.tick_count if p else 0,
                     "reason": f"Safety Layer: {reason}",
                     "symbol": symbol,
-                    "atr": p.engine.get_atr("1m") if p else 0,
+                    "atr": atr,
                     "confidence": confidence,
                     "regime": market_mode,
                     "volatility": "N/A",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": self._now_timestamp()
                 })
                 return
 
@@ -860,7 +1385,7 @@ class DerivConnector:
             # Activate Scalper Monitors for this specific trade
             if buy_resp and 'buy' in buy_resp and symbol in self.processors:
                 p = self.processors[symbol]
-                volatility_state = p.engine.get_volatility("1m")
+                volatility_state, candles_1m = await p.run_locked(p.order_context)
                 entry_price = float(buy_resp.get('buy', {}).get('buy_price', 0))
                 
                 # Retrieve from metadata we just passed
@@ -874,7 +1399,7 @@ class DerivConnector:
                     )
                 if s_tpsl:
                     s_tpsl.get_scalper_tp_sl(
-                        candles=list(p.engine.candles_1m),
+                        candles=candles_1m,
                         symbol=symbol,
                         direction="BUY" if contract_type in ["CALL", "MULTUP"] else "SELL",
                         entry_price=entry_price
@@ -882,43 +1407,77 @@ class DerivConnector:
         except Exception as e:
             logger.error(f"Error in execute_order for {symbol}: {e}")
 
+    async def get_contracts_for(self, api_symbol: str, debounce: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Available contracts for a symbol, cached for CONTRACTS_CACHE_TTL seconds.
+        Returns the cache entry {"data": [...], "by_type": {contract_type: first contract},
+        "timestamp": monotonic}, or None if the refresh failed.
+        """
+        cached = self.contracts_cache.get(api_symbol)
+        if cached:
+            if (time.monotonic() - cached['timestamp']) < CONTRACTS_CACHE_TTL:
+                logger.info(f"Using cached contracts for {api_symbol}")
+                return cached
+            # Expired: drop it now rather than holding stale data until the refresh lands
+            del self.contracts_cache[api_symbol]
+        
+        if debounce:
+            await asyncio.sleep(0.1) # 100ms debounce
+        
+        # Concurrent trades on the same symbol share one in-flight request
+        refresh = self._contracts_inflight.get(api_symbol)
+        if refresh is None:
+            refresh = asyncio.create_task(self._refresh_contracts_for(api_symbol))
+            self._contracts_inflight[api_symbol] = refresh
+            refresh.add_done_callback(lambda _: self._contracts_inflight.pop(api_symbol, None))
+        # Shield so one cancelled caller doesn't abort the refresh for the others
+        return await asyncio.shield(refresh)
+
+    async def _refresh_contracts_for(self, api_symbol: str) -> Optional[Dict[str, Any]]:
+        contracts_resp = await self.send_request({"contracts_for": api_symbol})
+        
+        if 'error' in contracts_resp:
+            audit_logger.log_error("FIFO_REFRESH_FAILED", contracts_resp['error'])
+            logger.error(f"FIFO Refresh Failed: {contracts_resp['error']}")
+            return None
+            
+        contracts = contracts_resp.get('contracts_for', {}).get('available', [])
+        # Type index built once per refresh and reused by every trade until expiry
+        entry = {"data": contracts, "by_type": index_contracts(contracts), "timestamp": time.monotonic()}
+        cache = self.contracts_cache
+        cache[api_symbol] = entry
+        cache.move_to_end(api_symbol)
+        if len(cache) > MAX_CONTRACTS_CACHE_ENTRIES:
+            cache.popitem(last=False)
+        return entry
+
     async def execute_buy(self, symbol: str, contract_type: str, amount: float, duration: int = 5, duration_unit: str = 't', multiplier: int = None, metadata: dict = None):
         """
         Executes a real trade on Deriv with FIFO validation.
         """
         logger.info(f"Initiating Trade: {contract_type} on {symbol} for {amount} ({duration}{duration_unit}). Metadata: {metadata}")
         
+        # Map symbols to API format
+        api_symbol = SYMBOL_MAP.get(symbol, symbol)
+        
+        # 1. FIFO Refresh (Get available contracts with 5-minute cache)
+        # Resolved before taking the trade lock so concurrent trades overlap this round-trip;
+        # only proposal + buy are serialized.
+        try:
+            # Add a tiny jitter if multiple manual trades are spammed
+            contracts_entry = await self.get_contracts_for(
+                api_symbol, debounce=bool(metadata and metadata.get("source") == "Manual")
+            )
+        except Exception as e:
+            logger.error(f"Execution Error: {e}")
+            return {"status": "error", "message": str(e)}
+        if contracts_entry is None:
+            return {"status": "error", "message": "FIFO Refresh Failed"}
+        contracts = contracts_entry['data']
+        contracts_by_type = contracts_entry['by_type']
+        
         async with self.trade_lock:
             try:
-                # Map symbols to API format
-                api_symbol = symbol
-                if symbol == "BOOM300": api_symbol = "BOOM300N"
-                elif symbol == "CRASH300": api_symbol = "CRASH300N"
-                
-                # 1. FIFO Refresh (Get available contracts with 5-minute cache)
-                now = time.time()
-                contracts = []
-                
-                if api_symbol in self.contracts_cache and (now - self.contracts_cache[api_symbol]['timestamp']) < 300:
-                    contracts = self.contracts_cache[api_symbol]['data']
-                    logger.info(f"Using cached contracts for {api_symbol}")
-                else:
-                    # Add a tiny jitter if multiple manual trades are spammed
-                    if metadata and metadata.get("source") == "Manual":
-                        await asyncio.sleep(0.1) # 100ms debounce
-                        
-                    contracts_req = {"contracts_for": api_symbol}
-                    contracts_resp = await self.send_request(contracts_req)
-                    
-                    if 'error' in contracts_resp:
-                        from app.services.audit_logger import audit_logger
-                        audit_logger.log_error("FIFO_REFRESH_FAILED", contracts_resp['error'])
-                        logger.error(f"FIFO Refresh Failed: {contracts_resp['error']}")
-                        return {"status": "error", "message": "FIFO Refresh Failed"}
-                        
-                    contracts = contracts_resp.get('contracts_for', {}).get('available', [])
-                    self.contracts_cache[api_symbol] = {"data": contracts, "timestamp": time.time()}
-                
                 # DEBUG: Log available contract types for this symbol
                 logger.info(f"Available Contracts for {symbol} (API: {api_symbol}): {[c['contract_type'] for c in contracts[:5]]}")
                 
@@ -945,8 +1504,8 @@ class DerivConnector:
                         effective_contract_type = "MULTDOWN"
                     
                     if effective_contract_type in ["MULTUP", "MULTDOWN"]:
-                        valid_multipliers = [c.get('multiplier') for c in contracts if c['contract_type'] == effective_contract_type]
-                        if valid_multipliers and not selected_multiplier:
+                        has_multiplier_contract = effective_contract_type in contracts_by_type
+                        if has_multiplier_contract and not selected_multiplier:
                              selected_multiplier = 20 
                     
                     if effective_contract_type != contract_type:
@@ -954,16 +1513,18 @@ class DerivConnector:
 
                 # 2. Validation & Clamping
                 action_code = 1 if effective_contract_type in ["CALL", "MULTUP"] else 2
-                mock_signal = {
-                    "symbol": api_symbol,
-                    "action": action_code,
-                    "lots": amount,
-                    "duration": effective_duration,
-                    "duration_unit": effective_duration_unit,
-                    "contract_type": effective_contract_type,
-                    "multiplier": selected_multiplier
-                }
-                validated_params = TradeManager.validate_and_clamp(mock_signal, contracts)
+                # Dashboard side follows the same classification as the signal/metadata action
+                side = 'buy' if action_code == 1 else 'sell'
+                trade_signal = TradeSignal(
+                    symbol=api_symbol,
+                    action=action_code,
+                    lots=amount,
+                    duration=effective_duration,
+                    duration_unit=effective_duration_unit,
+                    contract_type=effective_contract_type,
+                    multiplier=selected_multiplier
+                )
+                validated_params = TradeManager.validate_and_clamp(trade_signal, contracts, contracts_by_type)
                 
                 if not validated_params:
                     logger.warning("Trade Rejected by FIFO Validation Guard")
@@ -980,7 +1541,6 @@ class DerivConnector:
                 proposal_resp = await self.send_request(proposal_req)
                 
                 if 'proposal' in proposal_resp:
-                    from app.services.audit_logger import audit_logger
                     proposal_data = proposal_resp['proposal']
                     proposal_id = proposal_data['id']
                     
@@ -993,18 +1553,22 @@ class DerivConnector:
                     
                     logger.info(f"RAW BUY RESPONSE from Deriv: {buy_resp}")
                     
+                    # One wall-clock stamp per fill, shared by the execution event,
+                    # the position, log and journal entry
+                    opened_at = self._now_timestamp()
+                    
                     # Broadcast trade execution
                     await stream_manager.broadcast_event('trade_execution', {
                         "symbol": symbol,
                         "contract_type": effective_contract_type,
                         "buy_price": float(buy_resp.get('buy', {}).get('buy_price', 0)),
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": opened_at,
                         "id": buy_resp.get('buy', {}).get('contract_id')
                     })
                     
                     # Log to Audit
                     audit_logger.log_trade(
-                        signal=metadata.get('signal', mock_signal) if metadata else mock_signal,
+                        signal=metadata.get('signal', trade_signal) if metadata else trade_signal,
                         validation=validated_params['validation_metadata'],
                         response=buy_resp
                     )
@@ -1018,24 +1582,10 @@ class DerivConnector:
                         )
                         return {"status": "error", "message": err_msg}
                     
-                    await stream_manager.broadcast_notification(
-                        "Trade Executed",
-                        f"Placed {contract_type} on {symbol} (Stake: {validated_params['amount']})",
-                        "success"
-                    )
-                    
-                    await stream_manager.broadcast_log({
-                        "id": str(uuid.uuid4()),
-                        "timestamp": datetime.now().isoformat(),
-                        "message": f"Successfully placed {contract_type} on {symbol} (Stake: {validated_params['amount']})",
-                        "level": "success",
-                        "source": "Execution"
-                    })
-                    
                     # Record for tracking
                     if metadata:
                         cid = str(buy_resp['buy']['contract_id'])
-                        self.contract_metadata[cid] = {
+                        self._track_contract(cid, {
                             "contract_id": cid,
                             "symbol": symbol,
                             "action": "BUY" if action_code == 1 else "SELL",
@@ -1045,47 +1595,67 @@ class DerivConnector:
                             "strategy": metadata.get('strategy'),
                             "scalper_exit": metadata.get('scalper_exit'),
                             "scalper_tpsl": metadata.get('scalper_tpsl')
-                        }
+                        })
+                        
+                        # Bound memory if settle events were missed (evict oldest)
+                        if len(self.contract_metadata) > MAX_CONTRACT_METADATA:
+                            stale_cid = next(iter(self.contract_metadata))
+                            self._untrack_contract(stale_cid)
+                            logger.warning(f"Contract metadata limit reached, dropped tracking for {stale_cid}")
                     
                     # OPTIMISTIC UI UPDATE
                     new_pos_id = str(buy_resp['buy']['contract_id'])
                     entry_price = float(buy_resp['buy']['buy_price'])
                     current_price = entry_price
                     
-                    optimistic_pos = {
-                        "id": new_pos_id,
-                        "symbol": symbol,
-                        "side": 'buy' if any(kw in contract_type for kw in ['CALL', 'MULTUP', 'ACCU', 'BUY']) else 'sell',
-                        "lots": float(amount),
-                        "entryPrice": entry_price,
-                        "currentPrice": current_price,
-                        "pnl": 0.0,
-                        "openTime": datetime.now().isoformat()
-                    }
+                    optimistic_pos = Position(
+                        id=new_pos_id,
+                        symbol=symbol,
+                        side=side,
+                        lots=float(amount),
+                        entryPrice=entry_price,
+                        currentPrice=current_price,
+                        pnl=0.0,
+                        openTime=opened_at
+                    )
                     
-                    if not any(p['id'] == new_pos_id for p in self.open_positions):
-                        self.open_positions.append(optimistic_pos)
-                        await stream_manager.broadcast_event('positions', self.open_positions)
+                    # Independent UI side effects: fan out together rather than one after another
+                    side_effects = [
+                        stream_manager.broadcast_notification(
+                            "Trade Executed",
+                            f"Placed {contract_type} on {symbol} (Stake: {validated_params['amount']})",
+                            "success"
+                        ),
+                        self._emit_log(
+                            f"Successfully placed {contract_type} on {symbol} (Stake: {validated_params['amount']})",
+                            "success", "Execution", timestamp=opened_at
+                        )
+                    ]
+                    
+                    if new_pos_id not in self.open_positions:
+                        self.open_positions[new_pos_id] = optimistic_pos
+                        side_effects.append(
+                            stream_manager.broadcast_event('positions', list(self.open_positions.values()))
+                        )
                         logger.info("Optimistic UI Update executed for new position.")
+                    
+                    await asyncio.gather(*side_effects)
 
                     # === AUTO-JOURNAL BOT TRADES ===
                     try:
-                        from app.api.journal import add_journal_entry
-                        import uuid as uuid_mod
-                        
                         # Use the actual spot price from proposal for the journal
                         actual_entry_price = float(proposal_data.get('spot', entry_price))
                         strategy_name = metadata.get('strategy', 'Unknown Bot') if metadata else 'Unknown Bot'
                         
                         journal_entry = {
-                            "id": str(uuid_mod.uuid4()),
+                            "id": str(uuid.uuid4()),
                             "tradeId": new_pos_id,
                             "symbol": symbol,
-                            "side": 'buy' if any(kw in contract_type for kw in ['CALL', 'MULTUP', 'ACCU', 'BUY']) else 'sell',
+                            "side": side,
                             "entryPrice": actual_entry_price,
                             "exitPrice": 0.0,  # Will be updated on close
                             "pnl": 0.0,  # Will be updated on close
-                            "date": datetime.now().isoformat(),
+                            "date": opened_at,
                             "notes": f"[AUTO] Bot executed {contract_type} trade. Strategy: {strategy_name}",
                             "tags": ["Bot Trade", strategy_name],
                             "screenshots": [],
@@ -1102,17 +1672,27 @@ class DerivConnector:
 
                     return {"status": "success", "data": buy_resp['buy']}
                 else:
-                    from app.services.audit_logger import audit_logger
                     audit_logger.log_error("PROPOSAL_FAILED", proposal_resp.get('error'))
                     logger.error(f"Proposal Failed: {proposal_resp}")
                     return {"status": "error", "message": proposal_resp.get('error', {}).get('message', 'Proposal Failed')}
                     
             except Exception as e:
-                logger.error(f"Execution Error: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+                logger.error(f"Execution Error: {e}", exc_info=True)
                 return {"status": "error", "message": str(e)}
 
+    def _track_contract(self, cid: str, meta: Dict):
+        """Register local SL/TP metadata in both the ordered store and the symbol index."""
+        self.contract_metadata[cid] = meta
+        self.contract_metadata_by_symbol[meta["symbol"]][cid] = meta
+
+    def _untrack_contract(self, cid: str):
+        """Drop a contract's metadata from both indexes (no-op if unknown)."""
+        meta = self.contract_metadata.pop(cid, None)
+        if meta is not None:
+            symbol_contracts = self.contract_metadata_by_symbol.get(meta["symbol"])
+            if symbol_contracts is not None:
+                symbol_contracts.pop(cid, None)
+
     async def monitor_positions_for_sl_tp(self, current_price: float, symbol: str, 
                                           momentum_up: bool = None, momentum_down: bool = None, 
                                           slope_value: float = 0.0, volatility_state: str = None):
@@ -1120,45 +1700,51 @@ class DerivConnector:
         Monitor open positions and close them if local SL/TP thresholds are hit.
         This also handles Scalper Exits and Breakeven triggers.
         """
-        closed_contracts = []
+        # Fast path: most symbols have no locally tracked contract on a given tick
+        symbol_contracts = self.contract_metadata_by_symbol.get(symbol)
+        if not symbol_contracts:
+            return
+        
+        to_close = []
         
         # Get Processor for scalper status
         p = self.processors.get(symbol)
         
-        for contract_id, meta in list(self.contract_metadata.items()):
-            if meta.get('symbol') != symbol:
+        # Latest 1m candle for the scalper exits (snapshot published under the stack's lock)
+        current_candle = p.last_candle_1m if p else None
+        
+        # SL/TP levels as arrays (NaN = unset) checked in one kernel call for the symbol
+        rows = list(symbol_contracts.items())
+        n = len(rows)
+        entries = np.fromiter((_level(m.get('entry_price')) for _, m in rows), dtype=np.float64, count=n)
+        sls = np.fromiter((_level(m.get('stop_loss')) for _, m in rows), dtype=np.float64, count=n)
+        tps = np.fromiter((_level(m.get('take_profit')) for _, m in rows), dtype=np.float64, count=n)
+        is_buy = np.fromiter((m.get('action', 'BUY') == "BUY" for _, m in rows), dtype=np.bool_, count=n)
+        # SELL levels have always been truthiness-checked: a zero level counts as unset
+        is_sell = ~is_buy
+        sls[is_sell & (sls == 0)] = np.nan
+        tps[is_sell & (tps == 0)] = np.nan
+        hits = sltp_hits(current_price, entries, sls, tps, is_buy)
+        
+        for i in np.flatnonzero(~np.isnan(entries)):
+            contract_id, meta = rows[i]
+            if contract_id in self._closing_contracts:
                 continue
-                
-            entry_price = float(meta.get('entry_price')) if meta.get('entry_price') is not None else None
-            sl_price = float(meta.get('stop_loss')) if meta.get('stop_loss') is not None else None
-            tp_price = float(meta.get('take_profit')) if meta.get('take_profit') is not None else None
             action = meta.get('action', 'BUY')
             
-            if entry_price is None:
-                continue
-            
-            logger.info(f"Checking SL/TP for {symbol} trade {contract_id}: Price={current_price}, SL={sl_price}, TP={tp_price}, Entry={entry_price}, Action={action}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Checking SL/TP for %s trade %s: Price=%s, SL=%s, TP=%s, Entry=%s, Action=%s",
+                             symbol, contract_id, current_price, sls[i], tps[i], entries[i], action)
             
             should_close = False
             close_reason = ""
-            
-            # For BUY trades (CALL options)
-            if action == "BUY":
-                if sl_price is not None and current_price <= sl_price:
-                    should_close = True
-                    close_reason = f"Stop Loss Hit (Price: {current_price} <= SL: {sl_price})"
-                elif tp_price is not None and current_price >= tp_price:
-                    should_close = True
-                    close_reason = f"Take Profit Hit (Price: {current_price} >= TP: {tp_price})"
-            
-            # For SELL trades (PUT options)
-            else:
-                if sl_price and current_price >= sl_price:
-                    should_close = True
-                    close_reason = f"Stop Loss Hit (Price: {current_price} >= SL: {sl_price})"
-                elif tp_price and current_price <= tp_price:
-                    should_close = True
-                    close_reason = f"Take Profit Hit (Price: {current_price} <= TP: {tp_price})"
+            hit = hits[i]
+            if hit:
+                should_close = True
+                if hit == 1:
+                    close_reason = f"Stop Loss Hit (Price: {current_price} {'<=' if is_buy[i] else '>='} SL: {float(sls[i])})"
+                else:
+                    close_reason = f"Take Profit Hit (Price: {current_price} {'>=' if is_buy[i] else '<='} TP: {float(tps[i])})"
             
             if should_close:
                 logger.info(f"[LOCAL SL/TP] {close_reason} for Contract {contract_id}")
@@ -1166,9 +1752,6 @@ class DerivConnector:
             # --- SCALPER EXTRA EXITS ---
             if not should_close and p:
                 # 1. Check for Scalper Exit (RSI Flip, Micro Reversal, etc.)
-                candles = list(p.engine.candles_1m)
-                current_candle = candles[-1] if candles else None
-                
                 # Use ISOLATED monitors from metadata
                 trade_scalper_exit = meta.get('scalper_exit')
                 trade_scalper_tpsl = meta.get('scalper_tpsl')
@@ -1195,37 +1778,51 @@ class DerivConnector:
                         logger.info(f"[SCALPER BREAKEVEN] Moved SL to {meta['stop_loss']} for {symbol} (Contract: {contract_id})")
             
             if should_close:
-                # Close the position via Deriv API
+                to_close.append((contract_id, action, close_reason))
+        
+        if not to_close:
+            return
+        
+        # Sells run in their own task so the round-trip never stalls this symbol's ticks
+        self._closing_contracts.update(contract_id for contract_id, _, _ in to_close)
+        self._spawn_exit(self._close_positions(symbol, to_close))
+
+    def _spawn_exit(self, coro):
+        """Run an exit path as its own task, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._exit_tasks.add(task)
+        task.add_done_callback(self._exit_tasks.discard)
+
+    async def _close_positions(self, symbol: str, to_close: List[Tuple[str, str, str]]):
+        """Sell every position hit by the local SL/TP monitor."""
+        try:
+            # Close every hit position via Deriv API at once: one round-trip for a cascade, not N
+            close_resps = await asyncio.gather(
+                *[self.send_request({"sell": int(contract_id), "price": 0}) for contract_id, _, _ in to_close],
+                return_exceptions=True
+            )
+        
+            for (contract_id, action, close_reason), close_resp in zip(to_close, close_resps):
                 try:
-                    close_req = {"sell": int(contract_id), "price": 0}
-                    close_resp = await self.send_request(close_req)
-                    
+                    if isinstance(close_resp, BaseException):
+                        raise close_resp
                     if 'error' in close_resp:
                         logger.error(f"Failed to close contract {contract_id}: {close_resp['error']}")
-                    else:
-                        logger.info(f"Successfully closed contract {contract_id}")
-                        # Isolated monitors handled by metadata cleanup below
-                        
-                        await stream_manager.broadcast_notification(
-                            "Position Closed",
-                            close_reason,
-                            "info"
-                        )
-                        await stream_manager.broadcast_log({
-                            "id": str(uuid.uuid4()),
-                            "timestamp": datetime.now().isoformat(),
-                            "message": f"Closed {action} position on {symbol}: {close_reason}",
-                            "level": "info",
-                            "source": "SL/TP Monitor"
-                        })
-                        closed_contracts.append(contract_id)
+                        continue
+                    logger.info(f"Successfully closed contract {contract_id}")
+                    # Isolated monitors handled by the metadata cleanup
+                    self._untrack_contract(contract_id)
+                
+                    await stream_manager.broadcast_notification(
+                        "Position Closed",
+                        close_reason,
+                        "info"
+                    )
+                    await self._emit_log(f"Closed {action} position on {symbol}: {close_reason}", "info", "SL/TP Monitor")
                 except Exception as e:
-                    logger.error(f"Error closing contract {contract_id}: {e}")
-        
-        # Remove closed contracts from metadata
-        for cid in closed_contracts:
-            if cid in self.contract_metadata:
-                del self.contract_metadata[cid]
+                    logger.error(f"Error closing contract {contract_id}: {e}", exc_info=True)
+        finally:
+            self._closing_contracts.difference_update(contract_id for contract_id, _, _ in to_close)
 
 
     async def handle_balance(self, balance_data):
@@ -1269,169 +1866,189 @@ class DerivConnector:
         except Exception:
             pass
 
+    def _mark_positions_dirty(self):
+        """Schedule a coalesced 'positions' broadcast (at most one per POSITIONS_BROADCAST_INTERVAL)."""
+        self._positions_dirty.set()
+        if self._positions_task is None or self._positions_task.done():
+            self._positions_task = asyncio.create_task(self._positions_broadcast_loop())
+
+    async def _positions_broadcast_loop(self):
+        while True:
+            await self._positions_dirty.wait()
+            # Let a burst of portfolio/contract updates land before broadcasting
+            await asyncio.sleep(POSITIONS_BROADCAST_INTERVAL)
+            self._positions_dirty.clear()
+            if not stream_manager.has_subscribers:
+                continue
+            try:
+                positions = list(self.open_positions.values())
+                frame = (stream_manager.subscriber_epoch, json_dumps({"type": "positions", "data": positions}))
+                if frame == self._last_positions_frame:
+                    continue
+                self._last_positions_frame = frame
+                await stream_manager.broadcast_event('positions', positions, frame[1])
+            except Exception as e:
+                logger.error(f"Positions broadcast failed: {e}")
+
+    def _run_exit_guards(self, cids):
+        try:
+            self._check_exit_guards(cids)
+        except Exception as e:
+            logger.error(f"Error in Exit Guard: {e}", exc_info=True)
+
+    def _check_exit_guards(self, cids):
+        """
+        Trailing & local SL/TP enforcement for the given positions, in one vectorized
+        pass. Runs on every contract update (spot prices); only the broadcast is coalesced.
+        """
+        rows = []
+        for cid in cids:
+            metadata = self.contract_metadata.get(cid)
+            pos = self.open_positions.get(cid)
+            if not metadata or pos is None or metadata.get('stop_loss') is None or not metadata.get('action'):
+                continue
+            rows.append((cid, metadata, pos))
+        if not rows:
+            return
+
+        n = len(rows)
+        prices = np.fromiter((pos.currentPrice for _, _, pos in rows), dtype=np.float64, count=n)
+        entries = np.fromiter((pos.entryPrice for _, _, pos in rows), dtype=np.float64, count=n)
+        sls = np.fromiter((m['stop_loss'] for _, m, _ in rows), dtype=np.float64, count=n)
+        # Missing/zero TP disables the take-profit side
+        tps = np.fromiter((m.get('take_profit') or np.nan for _, m, _ in rows), dtype=np.float64, count=n)
+        is_buy = np.fromiter((m['action'] == "BUY" for _, m, _ in rows), dtype=np.bool_, count=n)
+
+        new_sls = DynamicTakeProfit.trailing_updates(prices, entries, sls, is_buy)
+
+        # Exit checks use the SL in force before this pass's trailing move
+        sl_hit = np.where(is_buy, prices <= sls, prices >= sls)
+        tp_hit = np.where(is_buy, prices >= tps, prices <= tps) & ~sl_hit
+
+        for i in np.flatnonzero(~np.isnan(new_sls) & (new_sls != 0)):
+            cid, metadata, _ = rows[i]
+            new_sl = float(new_sls[i])
+            logger.info(f"Trailing SL Update for {cid}: {metadata['stop_loss']} -> {new_sl}")
+            metadata['stop_loss'] = new_sl
+
+        for i in np.flatnonzero(sl_hit | tp_hit):
+            cid = rows[i][0]
+            exit_reason = "Stop Loss Hit (Local)" if sl_hit[i] else "Take Profit Hit (Local)"
+            logger.warning(f"Triggering Local Exit for {cid}: {exit_reason}")
+            self._spawn_exit(self.send_exit_sell(cid, exit_reason))
+
     async def handle_portfolio(self, portfolio):
         """Handles initial list and updates of open positions."""
         raw_contracts = portfolio.get('contracts', [])
-        new_positions = []
+        new_positions = {}
         
         for c in raw_contracts:
-            contract_type = c.get('contract_type', '').upper()
+            get = c.get
+            cid = str(get('contract_id'))
             
             # Robust price mapping for initial portfolio state
-            entry_price = float(c.get('entry_tick') or c.get('entry_spot') or c.get('buy_price') or 0)
-            current_price = float(c.get('bid_price') or c.get('current_spot') or 0)
-            
-            pos = {
-                "id": str(c.get('contract_id')),
-                "symbol": c.get('symbol'),
-                "side": 'buy' if any(kw in contract_type for kw in ['CALL', 'MULTUP', 'ACCU', 'BUY']) else 'sell',
-                "lots": float(c.get('buy_price', 0)),
-                "entryPrice": entry_price,
-                "currentPrice": current_price,
-                "pnl": float(c.get('profit', 0)),
-                "openTime": datetime.fromtimestamp(c.get('purchase_time', 0)).isoformat()
-            }
-            new_positions.append(pos)
+            new_positions[cid] = Position(
+                id=cid,
+                symbol=get('symbol'),
+                side=_position_side(get('contract_type', '').upper()),
+                lots=float(get('buy_price', 0)),
+                entryPrice=_first_float(c, PORTFOLIO_ENTRY_KEYS),
+                currentPrice=_first_float(c, PORTFOLIO_CURRENT_KEYS),
+                pnl=float(get('profit', 0)),
+                openTime=_purchase_time_iso(get('purchase_time', 0))
+            )
             
+        # No exit guards here: portfolio rows carry bid value/stake, not spot levels
         self.open_positions = new_positions
-        await stream_manager.broadcast_event('positions', self.open_positions)
+        self._mark_positions_dirty()
         logger.info(f"Portfolio Sync: {len(self.open_positions)} positions found")
 
     async def handle_position_update(self, contract):
         """Handles real-time updates for a specific open contract."""
-        cid = str(contract.get('contract_id'))
-        is_sold = contract.get('is_sold')
-        is_expired = contract.get('is_expired')
-        status = contract.get('status', '')
+        # Runs per streamed contract update: bind the hot lookups once
+        get = contract.get
+        positions = self.open_positions
+        cid = str(get('contract_id'))
+        is_sold = get('is_sold')
+        is_expired = get('is_expired')
+        status = get('status', '')
         
         # Remove position if sold, expired, or has a terminal status (won/lost)
-        is_settled = is_sold or is_expired or status in ['won', 'lost']
+        is_settled = is_sold or is_expired or status in _SETTLED_STATUSES
         
         if is_settled:
             # Remove from active positions
-            original_count = len(self.open_positions)
-            self.open_positions = [p for p in self.open_positions if p['id'] != cid]
+            removed = positions.pop(cid, None)
             # Cleanup metadata
-            self.contract_metadata.pop(cid, None)
+            self._untrack_contract(cid)
             
-            # Immediately broadcast removal if anything changed
-            if len(self.open_positions) < original_count:
-                await stream_manager.broadcast_event('positions', self.open_positions)
+            if removed is not None:
+                self._mark_positions_dirty()
                 logger.info(f"Position {cid} removed from active list (status: {status}, is_sold: {is_sold}, is_expired: {is_expired})")
         else:
             # Update or Add position
-            contract_type = contract.get('contract_type', '').upper()
             # Correct price mapping: Prioritize entry_tick/spot over current_spot.
             # Do NOT use buy_price as it represents the STAKE.
-            entry_price = float(contract.get('entry_tick') or contract.get('entry_spot') or contract.get('current_spot') or 0)
-            current_price = float(contract.get('current_spot') or contract.get('bid_price') or 0)
-            
-            pos = {
-                "id": cid,
-                "symbol": contract.get('underlying'),
-                "side": 'buy' if any(kw in contract_type for kw in ['CALL', 'MULTUP', 'ACCU', 'BUY']) else 'sell',
-                "lots": float(contract.get('buy_price', 0)),
-                "entryPrice": entry_price,
-                "currentPrice": current_price,
-                "pnl": float(contract.get('profit', 0)),
-                "openTime": datetime.fromtimestamp(contract.get('purchase_time', 0)).isoformat()
-            }
+            entry_price = _first_float(contract, ENTRY_KEYS)
+            current_price = _first_float(contract, CURRENT_KEYS)
+            pnl = float(get('profit', 0))
             
-            # Trailing & Exit Enforcement (Wrapped for robustness)
-            try:
-                metadata = self.contract_metadata.get(cid)
-                if metadata:
-                    current_sl = metadata.get('stop_loss')
-                    current_tp = metadata.get('take_profit')
-                    direction = metadata.get('action') # "BUY" or "SELL"
-                    
-                    if current_sl is not None and direction:
-                        # Get processor for symbol
-                        sym = contract.get('underlying')
-                        p = self.processors.get(sym)
-                        
-                        if p and hasattr(p, 'dynamic_tp'):
-                            # Check Trailing Update
-                            new_sl = p.dynamic_tp.check_trailing_update(
-                                current_price, entry_price, current_sl, direction
-                            )
-                        else:
-                            new_sl = None
-                        if new_sl:
-                            logger.info(f"Trailing SL Update for {cid}: {current_sl} -> {new_sl}")
-                            metadata['stop_loss'] = new_sl
-                            
-                        # Local Enforcement (Automatic Exit)
-                        should_exit = False
-                        exit_reason = ""
-                        
-                        if direction == "BUY":
-                            if current_price <= current_sl:
-                                should_exit = True
-                                exit_reason = "Stop Loss Hit (Local)"
-                            elif current_tp and current_price >= current_tp:
-                                should_exit = True
-                                exit_reason = "Take Profit Hit (Local)"
-                        else: # SELL
-                            if current_price >= current_sl:
-                                should_exit = True
-                                exit_reason = "Stop Loss Hit (Local)"
-                            elif current_tp and current_price <= current_tp:
-                                should_exit = True
-                                exit_reason = "Take Profit Hit (Local)"
-                                
-                        if should_exit:
-                            logger.warning(f"Triggering Local Exit for {cid}: {exit_reason}")
-                            asyncio.create_task(self.sell_contract(cid, exit_reason))
-            except Exception as e:
-                logger.error(f"Error in Exit Guard for {cid}: {e}")
+            changed = True
+            pos = positions.get(cid)
+            if pos is None:
+                positions[cid] = Position(
+                    id=cid,
+                    symbol=get('underlying'),
+                    side=_position_side(get('contract_type', '').upper()),
+                    lots=float(get('buy_price', 0)),
+                    entryPrice=entry_price,
+                    currentPrice=current_price,
+                    pnl=pnl,
+                    openTime=_purchase_time_iso(get('purchase_time', 0))
+                )
+            else:
+                # Already tracked: only the price fields move tick to tick
+                changed = (pos.currentPrice != current_price or pos.pnl != pnl
+                           or pos.entryPrice != entry_price)
+                if changed:
+                    pos.entryPrice = entry_price
+                    pos.currentPrice = current_price
+                    pos.pnl = pnl
             
-            found = False
-            for i, p in enumerate(self.open_positions):
-                if p['id'] == cid:
-                    self.open_positions[i] = pos
-                    found = True
-                    break
-            if not found:
-                self.open_positions.append(pos)
-        
+            if cid in self.contract_metadata:
+                self._run_exit_guards((cid,))
+            if not changed:
+                # Idle market: same snapshot as last time, nothing to broadcast
+                return
+
         # Session Stats & Final Processing for Settled Contracts
         if is_settled and cid not in self.processed_contracts:
-            self.processed_contracts.add(cid)
+            self.processed_contracts[cid] = None
             
-            # Limit set size to prevent memory growth (keep last 1000)
-            if len(self.processed_contracts) > 1000:
-                # Remove oldest half
-                to_remove = list(self.processed_contracts)[:500]
-                for old_cid in to_remove:
-                    self.processed_contracts.discard(old_cid)
+            # Limit size to prevent memory growth (evict oldest)
+            if len(self.processed_contracts) > MAX_PROCESSED_CONTRACTS:
+                self.processed_contracts.popitem(last=False)
             
             # Track P&L for session
-            profit = float(contract.get('profit', 0))
-            self.session_stats["pnl"] += profit
-            self.session_stats["trades"] += 1
-            if profit > 0:
-                self.session_stats["wins"] += 1
-            else:
-                self.session_stats["losses"] += 1
+            profit = float(get('profit', 0))
+            stats = self.session_stats
+            stats.pnl += profit
+            stats.trades += 1
+            won = profit > 0
+            stats.wins += won
+            stats.losses += not won
                 
             # Log completion
-            from app.services.audit_logger import audit_logger
             audit_logger.logger.info(f"Trade Closed: {cid} | P&L: {profit}")
             
-            await stream_manager.broadcast_log({
-                "id": str(uuid.uuid4()),
-                "timestamp": datetime.now().isoformat(),
-                "message": f"Trade Closed: {contract.get('underlying')} | P/L: ${profit:.2f}",
-                "level": "success" if profit >= 0 else "error",
-                "source": "Execution"
-            })
+            await self._emit_log(
+                f"Trade Closed: {get('underlying')} | P/L: ${profit:.2f}",
+                "success" if profit >= 0 else "error", "Execution"
+            )
             
             # === UPDATE JOURNAL ENTRY ON TRADE CLOSE ===
             try:
-                from app.api.journal import update_journal_entry_by_trade_id
-                
-                exit_price = float(contract.get('exit_tick') or contract.get('sell_spot') or contract.get('current_spot') or 0)
+                exit_price = _first_float(contract, EXIT_KEYS)
                 
                 update_data = {
                     'exitPrice': exit_price,
@@ -1446,7 +2063,7 @@ class DerivConnector:
                 logger.warning(f"Failed to update journal entry on close: {jrnl_err}")
             # === END UPDATE JOURNAL ===
                 
-        await stream_manager.broadcast_event('positions', self.open_positions)
+        self._mark_positions_dirty()
 
     async def sell_contract(self, contract_id: str, reason: str = "Manual Exit"):
         """
@@ -1466,18 +2083,55 @@ class DerivConnector:
         if 'error' in resp:
             err_msg = resp['error'].get('message', 'Unknown Error')
             logger.error(f"Failed to close contract {contract_id}: {resp['error']}")
-            await stream_manager.broadcast_log({
-                "id": str(uuid.uuid4()),
-                "timestamp": datetime.now().isoformat(),
-                "message": f"Exit Failed for {contract_id}: {err_msg}",
-                "level": "error",
-                "source": "Execution"
-            })
+            await self._emit_log(f"Exit Failed for {contract_id}: {err_msg}", "error", "Execution")
             return False, err_msg
             
         logger.info(f"Contract {contract_id} closed successfully ({reason}).")
         return True, None
 
+    async def send_exit_sell(self, contract_id: str, reason: str):
+        """
+        Fire-and-forget market sell for local SL/TP exits.
+        The ack is routed by req_id to _handle_sell_ack; the settled contract itself
+        arrives through the normal proposal_open_contract stream.
+        """
+        if not self.ws or not self.is_connected:
+            return
+        # A flash move can trip the guard on several flushes before the first sell settles
+        if contract_id in self._pending_sells.values():
+            return
+        
+        logger.info(f"Closing Contract {contract_id}. Reason: {reason}")
+        self.req_id_counter += 1
+        req_id = self.req_id_counter
+        self._pending_sells[req_id] = contract_id
+        # A lost ack must not block re-selling this contract for the rest of the session
+        asyncio.get_running_loop().call_later(REQUEST_TIMEOUT_SECONDS, self._expire_pending_sell, req_id)
+        req = {
+            "sell": int(contract_id) if str(contract_id).isdigit() else contract_id,
+            "price": 0, # 0 means market price
+            "req_id": req_id
+        }
+        try:
+            await self.ws.send(json_dumps(req))
+        except Exception as e:
+            self._pending_sells.pop(req_id, None)
+            logger.error(f"Failed to send exit for {contract_id}: {e}")
+
+    def _expire_pending_sell(self, req_id: int):
+        """Timer callback: forget a local-exit sell whose ack never arrived."""
+        contract_id = self._pending_sells.pop(req_id, None)
+        if contract_id is not None:
+            logger.warning(f"No ack for exit sell of {contract_id} (req_id {req_id}); it may be retried")
+
+    def _handle_sell_ack(self, contract_id: str, data: Dict):
+        if 'error' in data:
+            err_msg = data['error'].get('message', 'Unknown Error')
+            logger.error(f"Failed to close contract {contract_id}: {data['error']}")
+            asyncio.create_task(self._emit_log(f"Exit Failed for {contract_id}: {err_msg}", "error", "Execution"))
+        else:
+            logger.info(f"Contract {contract_id} closed successfully.")
+
     async def get_profit_table(self, limit: int = 50, offset: int = 0):
         """Fetches the profit table (closed trades history) from Deriv."""
         if not self.ws or not self.is_connected:
@@ -1513,110 +2167,101 @@ class DerivConnector:
         if not p:
             return None
         
-        # Get latest tick
-        candles = list(p.engine.candles_1m)
-        last_candle = candles[-1] if candles else None
-        
-        # We can re-run analysis or just use cached values if we had them.
-        # For now, let's derive it from the engine state.
-        volatility = p.engine.get_volatility("1m")
-        regime = p.engine.detect_market_mode(candles)
+        # Polls within the TTL on the same 1m candle get the last result
+        now = time.monotonic()
+        last_candle = p.last_candle_1m
+        candle_time = last_candle["time"] if last_candle else None
+        cached = self._ml_cache.get(symbol)
+        if cached and now - cached[0] < ML_PREDICTION_TTL and cached[1] == candle_time:
+            return cached[2]
         
+        # Derived from the engine state, in a worker thread under the stack's lock.
         # Calculate scores (this is a simplified logic)
         # In a real scenario, the strategy or a dedicated ML model would provide these.
-        indicator_data = p.indicator_layer.analyze(last_candle, engine=p.engine) if last_candle else {}
+        volatility, regime, indicator_data, rsi_hybrid = await p.run_locked(p.ml_inputs)
+        last_candle = p.last_candle_1m
+        candle_time = last_candle["time"] if last_candle else None
         
         # Mock probabilities for now based on indicators if no signal
         buy_prob = 0.5
         sell_prob = 0.5
         
         if indicator_data.get('rsi'):
-            rsi = indicator_data['rsi']
-            # Base probability from 1m RSI
-            buy_prob = max(0.2, min(0.8, (70 - rsi) / 40))
-            sell_prob = max(0.2, min(0.8, (rsi - 30) / 40))
-            
-            # Enhance with Multi-Timeframe Confirmation
-            rsi_hybrid = p.indicator_layer.get_multi_rsi_confirmation()
-            if rsi_hybrid.get("allow_buy"):
-                buy_prob = max(buy_prob, 0.75 + (rsi_hybrid.get("confidence_modifier", 0)))
-                sell_prob = min(sell_prob, 0.25)
-            elif rsi_hybrid.get("allow_sell"):
-                sell_prob = max(sell_prob, 0.75 + (rsi_hybrid.get("confidence_modifier", 0)))
-                buy_prob = min(buy_prob, 0.25)
-            
-            # Adjust by absolute direction
-            if rsi_hybrid.get("flow_1m") == "bullish": buy_prob += 0.05
-            if rsi_hybrid.get("flow_1m") == "bearish": sell_prob += 0.05
+            flow_1m = rsi_hybrid.get("flow_1m")
+            buy_prob, sell_prob = rsi_probabilities(
+                float(indicator_data['rsi']),
+                bool(rsi_hybrid.get("allow_buy")),
+                bool(rsi_hybrid.get("allow_sell")),
+                float(rsi_hybrid.get("confidence_modifier", 0)),
+                flow_1m == "bullish",
+                flow_1m == "bearish"
+            )
         else:
             buy_prob = 0.5
             sell_prob = 0.5
 
-        return {
+        prediction = {
             "symbol": symbol,
             "buyProbability": round(buy_prob, 2),
             "sellProbability": round(sell_prob, 2),
             "confidence": round(max(buy_prob, sell_prob), 2),
             "regime": regime,
             "volatility": volatility,
-            "lastUpdated": datetime.now().isoformat()
+            "lastUpdated": self._now_timestamp()
         }
+        self._ml_cache[symbol] = (now, candle_time, prediction)
+        return prediction
 
     async def disconnect(self):
         self.is_connected = False
         if self.listen_task:
             self.listen_task.cancel()
             self.listen_task = None
+        self._stop_tick_consumers()
         if self.ws:
             await self.ws.close()
             self.ws = None
         
         # Ensure Bot Stops on Disconnect
         try:
-            EngineWrapper.set_bot_state(False)
+            await asyncio.to_thread(EngineWrapper.set_bot_state, False)
         except:
             pass
 
     async def switch_symbol(self, new_symbol: str):
         """Dynamic symbol switching - adds to enabled list and primes history."""
         # Normalize symbol
-        api_symbol = new_symbol
-        if new_symbol in ["BOOM300", "BOOM_300"]: api_symbol = "BOOM300N"
-        elif new_symbol in ["CRASH300", "CRASH_300", "CRASH300S"]: api_symbol = "CRASH300N"
-        elif new_symbol.startswith("R") and "_" not in new_symbol:
-            api_symbol = "R_" + new_symbol[1:]
+        api_symbol = SYMBOL_MAP.get(new_symbol, new_symbol)
             
         # Add to enabled if not there
-        if api_symbol not in self.enabled_symbols:
+        if api_symbol not in self._enabled_symbol_set:
+            api_symbol = sys.intern(api_symbol)
             self.enabled_symbols.append(api_symbol)
+            self._enabled_symbol_set.add(api_symbol)
             # Re-subscribe to all (to include new one)
-            await self.subscribe_ticks()
+            self._schedule_subscribe()
             # Prime history
             # await self.warm_up_history()
             
         # Reset engine for clean start on this symbol
         if api_symbol in self.processors:
-            self.processors[api_symbol].engine.reset()
+            p = self.processors[api_symbol]
+            await p.run_locked(p.engine.reset)
             
         # Broadcast log
-        await stream_manager.broadcast_log({
-            "id": str(uuid.uuid4()),
-            "timestamp": datetime.now().isoformat(),
-            "message": f"Trading symbol switched/added: {api_symbol}",
-            "level": "info",
-            "source": "System"
-        })
+        await self._emit_log(f"Trading symbol switched/added: {api_symbol}", "info", "System")
         
         # self.target_symbol = api_symbol # Retired in multi-symbol refactor
         
         # Subscriptions
         if new_symbol not in self.active_symbols:
-            self.active_symbols.append(new_symbol)
-            await self.subscribe_ticks()
+            self.active_symbols.append(sys.intern(new_symbol))
+            self._schedule_subscribe()
 
         # Reset engine and stats for clean start
         if api_symbol in self.processors:
-            self.processors[api_symbol].engine.reset()
+            p = self.processors[api_symbol]
+            await p.run_locked(p.engine.reset)
         self.tick_count = 0
 
 # Global Singleton Instance
@@ -4,30 +4,75 @@ Provides voice-to-text transcription using OpenAI's Whisper API.
 """
 
 import os
-import io
 import logging
-import tempfile
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Keep-alive pool shared by every upload, so bursts reuse warm TLS connections
+WHISPER_MAX_CONNECTIONS = 20
+WHISPER_MAX_KEEPALIVE_CONNECTIONS = 10
+WHISPER_TIMEOUT_SECONDS = 30.0
+
+# Content types for the upload, by file extension
+AUDIO_MIME_TYPES = {
+    "webm": "audio/webm",
+    "mp3": "audio/mpeg",
+    "mpeg": "audio/mpeg",
+    "mpga": "audio/mpeg",
+    "m4a": "audio/mp4",
+    "mp4": "audio/mp4",
+    "wav": "audio/wav",
+    "ogg": "audio/ogg",
+}
+
 # Lazy initialization of OpenAI client
 _client = None
 
 def get_openai_client():
-    """Get OpenAI client with lazy initialization."""
+    """Get async OpenAI client with lazy initialization."""
     global _client
     if _client is None:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             logger.warning("OPENAI_API_KEY not found. Speech recognition will not work.")
             return None
-        _client = OpenAI(api_key=api_key)
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            timeout=WHISPER_TIMEOUT_SECONDS,
+            http_client=_build_http_client()
+        )
     return _client
 
 
+async def aclose():
+    """Close the shared client and its keep-alive pool (no-op if never created)."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.close()
+
+
+def _build_http_client():
+    """
+    Pooled httpx client for the SDK, or None (SDK default client) when httpx or
+    DefaultAsyncHttpxClient is unavailable. Imported here so a missing optional
+    dependency can never break importing the server.
+    """
+    try:
+        import httpx
+        from openai import DefaultAsyncHttpxClient
+    except ImportError:
+        logger.warning("httpx pooling unavailable; using the OpenAI SDK's default HTTP client.")
+        return None
+    return DefaultAsyncHttpxClient(limits=httpx.Limits(
+        max_connections=WHISPER_MAX_CONNECTIONS,
+        max_keepalive_connections=WHISPER_MAX_KEEPALIVE_CONNECTIONS
+    ))
+
+
 async def transcribe_audio(audio_data: bytes, filename: str = "audio.webm") -> str:
     """
     Transcribe audio data to text using OpenAI Whisper API.
@@ -44,29 +89,20 @@ async def transcribe_audio(audio_data: bytes, filename: str = "audio.webm") -> s
         if client is None:
             raise Exception("OPENAI_API_KEY not configured. Speech recognition is not available.")
         
-        # Create a temporary file to store the audio
-        suffix = os.path.splitext(filename)[1] if filename else ".webm"
+        # Upload the in-memory bytes directly; the extension drives Whisper's format detection
+        filename = filename or "audio.webm"
+        suffix = os.path.splitext(filename)[1].lstrip(".").lower()
+        mime_type = AUDIO_MIME_TYPES.get(suffix, "audio/webm")
         
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
+        response = await client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(filename, audio_data, mime_type),
+            response_format="text"
+        )
         
-        try:
-            # Open and transcribe the audio file
-            with open(temp_file_path, "rb") as audio_file:
-                response = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-            
-            transcribed_text = response.strip() if isinstance(response, str) else response.text.strip()
-            logger.info(f"Successfully transcribed audio: {transcribed_text[:50]}...")
-            return transcribed_text
-            
-        finally:
-            # Clean up temp file
-            os.unlink(temp_file_path)
+        transcribed_text = response.strip() if isinstance(response, str) else response.text.strip()
+        logger.info(f"Successfully transcribed audio: {transcribed_text[:50]}...")
+        return transcribed_text
             
     except Exception as e:
         logger.error(f"Speech recognition error: {e}")
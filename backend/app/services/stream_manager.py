@@ -1,14 +1,38 @@
 import asyncio
-from typing import List, Dict
+from collections import deque
+from typing import Dict, Optional, Set
 from fastapi import WebSocket
+from app.core.fast_json import dumps as json_dumps
+
+# Coalescing window for tick frames (~40 Hz UI refresh)
+TICK_FLUSH_INTERVAL = 0.025
+# Ticks held per symbol between flushes (the dashboard only keeps the last 50 anyway)
+MAX_PENDING_TICKS_PER_SYMBOL = 50
+# Frames buffered per SSE client; a client that falls further behind loses its oldest frames
+SSE_QUEUE_MAXSIZE = 1000
 
 class StreamManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.sse_queues: List[asyncio.Queue] = []
-        self.log_history: List[Dict] = []
+        # Sets: O(1) add/remove under reconnect churn (broadcast order between clients doesn't matter)
+        self.active_connections: Set[WebSocket] = set()
+        self.sse_queues: Set[asyncio.Queue] = set()
         self.max_history = 100
+        # Oldest entries fall off the front automatically once the history is full
+        self.log_history: deque = deque(maxlen=self.max_history)
         self.keep_alive_task = None
+        # Bumped whenever a client joins, so de-duplicating publishers re-send their state
+        self.subscriber_epoch = 0
+        
+        # Tick coalescing: ticks are queued here per symbol and flushed as one "ticks" frame.
+        # Bounded per symbol, so a stalled flush keeps only the latest ticks.
+        self.tick_buffer: Dict[str, deque] = {}
+        self.tick_ready = asyncio.Event()
+        self.tick_flush_task = None
+
+    @property
+    def has_subscribers(self) -> bool:
+        """True if at least one WebSocket or SSE client is connected."""
+        return bool(self.active_connections or self.sse_queues)
 
     async def _heartbeat_loop(self):
         """Send a ping every 30 seconds to keep connections alive."""
@@ -22,7 +46,8 @@ class StreamManager:
         client_host = websocket.client.host if websocket.client else "unknown"
         client_port = websocket.client.port if websocket.client else "unknown"
         print(f">>> [WS CONNECT] Client: {client_host}:{client_port} | Total: {len(self.active_connections) + 1}")
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        self.subscriber_epoch += 1
         
         # Start heartbeat if not running
         if self.keep_alive_task is None:
@@ -34,52 +59,99 @@ class StreamManager:
             client_host = websocket.client.host if websocket.client else "unknown"
             client_port = websocket.client.port if websocket.client else "unknown"
             print(f">>> [WS DISCONNECT] Client: {client_host}:{client_port} | Remaining: {len(self.active_connections) - 1}")
-            self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
 
     async def subscribe_sse(self) -> asyncio.Queue:
-        queue = asyncio.Queue()
-        self.sse_queues.append(queue)
+        queue = asyncio.Queue(maxsize=SSE_QUEUE_MAXSIZE)
+        self.sse_queues.add(queue)
+        self.subscriber_epoch += 1
         return queue
 
     def unsubscribe_sse(self, queue: asyncio.Queue):
-        if queue in self.sse_queues:
-            self.sse_queues.remove(queue)
+        self.sse_queues.discard(queue)
 
-    async def _broadcast(self, message: dict):
-        # Broadcast to WebSockets
-        dead_connections = []
-        for connection in self.active_connections:
+    async def _broadcast(self, message: dict, text: Optional[str] = None):
+        if not self.has_subscribers:
+            return
+        # Serialize once: WebSockets and SSE queues all get the same text frame
+        if text is None:
             try:
-                await connection.send_json(message)
-            except Exception as e:
-                client_host = connection.client.host if hasattr(connection, 'client') and connection.client else "unknown"
-                print(f">>> [WS BROADCAST ERROR] Client {client_host}: {e}")
-                dead_connections.append(connection)
+                text = json_dumps(message)
+            except TypeError as e:
+                print(f">>> [BROADCAST ERROR] Unserializable '{message.get('type')}' message: {e}")
+                return
         
-        for dead in dead_connections:
-            if dead in self.active_connections:
-                self.active_connections.remove(dead)
+        # Broadcast to WebSockets concurrently, so one slow client doesn't delay the rest
+        connections = list(self.active_connections)
+        if connections:
+            results = await asyncio.gather(
+                *[connection.send_text(text) for connection in connections],
+                return_exceptions=True
+            )
+            for connection, result in zip(connections, results):
+                if isinstance(result, Exception):
+                    client_host = connection.client.host if hasattr(connection, 'client') and connection.client else "unknown"
+                    print(f">>> [WS BROADCAST ERROR] Client {client_host}: {result}")
+                    self.active_connections.discard(connection)
         
-        # Broadcast to SSE Queues
+        # Broadcast to SSE Queues (never blocks: a full queue drops its oldest frame)
         for queue in self.sse_queues:
             try:
-                await queue.put(message)
+                queue.put_nowait(text)
+            except asyncio.QueueFull:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                queue.put_nowait(text)
             except Exception as e:
                 print(f">>> [SSE BROADCAST ERROR]: {e}")
 
     async def broadcast_tick(self, tick_data: dict):
-        await self._broadcast({"type": "tick", "data": tick_data})
+        self.enqueue_tick(tick_data)
+
+    def enqueue_tick(self, tick_data: dict):
+        """
+        Queue a tick for the next coalesced broadcast (non-blocking).
+        Ticks that arrive while a flush is in progress go out together in the next frame.
+        """
+        symbol = tick_data.get("symbol")
+        pending = self.tick_buffer.get(symbol)
+        if pending is None:
+            pending = self.tick_buffer[symbol] = deque(maxlen=MAX_PENDING_TICKS_PER_SYMBOL)
+        pending.append(tick_data)
+        self.tick_ready.set()
+        
+        # Start flusher if not running
+        if self.tick_flush_task is None or self.tick_flush_task.done():
+            self.tick_flush_task = asyncio.create_task(self._tick_flush_loop())
+
+    async def _tick_flush_loop(self):
+        """Drain the tick buffer into a single "ticks" frame per TICK_FLUSH_INTERVAL window."""
+        while True:
+            await self.tick_ready.wait()
+            # Let ticks from the other symbols land in the same frame
+            await asyncio.sleep(TICK_FLUSH_INTERVAL)
+            self.tick_ready.clear()
+            
+            pending = self.tick_buffer
+            if not pending:
+                continue
+            self.tick_buffer = {}
+            # Oldest first within each symbol
+            batch = [tick for ticks in pending.values() for tick in ticks]
+            if self.has_subscribers:
+                await self._broadcast({"type": "ticks", "data": batch})
 
     async def broadcast_log(self, log_entry: dict):
         # Store in history
         self.log_history.append(log_entry)
-        if len(self.log_history) > self.max_history:
-            self.log_history.pop(0)
             
         await self._broadcast({"type": "log", "data": log_entry})
 
-    async def broadcast_event(self, event_type: str, data: dict):
-        await self._broadcast({"type": event_type, "data": data})
+    async def broadcast_event(self, event_type: str, data: dict, text: Optional[str] = None):
+        """`text`: the caller's already-serialized {"type", "data"} frame, if it has one."""
+        await self._broadcast({"type": event_type, "data": data}, text)
 
     async def broadcast_skipped_signal(self, data: dict):
         """Broadcast a skipped signal event."""
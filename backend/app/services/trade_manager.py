@@ -1,32 +1,58 @@
 import logging
+from dataclasses import dataclass
 from typing import List, Dict, Optional, Any
 
 logger = logging.getLogger("trade_manager")
 
+@dataclass(slots=True)
+class TradeSignal:
+    """Trade request as validated against the refreshed contracts list."""
+    symbol: str
+    action: int  # 1 = buy side, 2 = sell side
+    lots: float = 0.35  # Deriv minimum stake
+    duration: int = 5
+    duration_unit: str = 't'
+    contract_type: Optional[str] = None
+    multiplier: Optional[int] = None
+
+def index_contracts(contracts: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """First contract per contract_type (same pick as a front-to-back scan)."""
+    by_type: Dict[str, Dict[str, Any]] = {}
+    for c in contracts:
+        by_type.setdefault(c.get('contract_type'), c)
+    return by_type
+
 class TradeManager:
     @staticmethod
-    def validate_and_clamp(signal: dict, contracts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def validate_and_clamp(signal: TradeSignal, contracts: List[Dict[str, Any]],
+                           contracts_by_type: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
         """
         Production-Ready FIFO Refresh Guard:
         1. Identify correct contract type from refreshed list.
         2. Validate stake against min/max limits.
         3. Clamp if necessary.
         4. Return clean proposal parameters.
+
+        `contracts_by_type` (index_contracts() output, cached by the connector
+        per refresh) replaces the linear scan when provided.
         """
-        action = signal.get('action')
-        symbol = signal.get('symbol')
-        requested_stake = signal.get('lots', 0.35) # Default to Deriv min if missing
+        action = signal.action
+        symbol = signal.symbol
+        requested_stake = signal.lots
         
         # Map Action to Contract Type (CALL=Buy, PUT=Sell)
         # If contract_type is provided in signal (e.g. MULTUP), use it.
         # Otherwise default to standard CALL/PUT
-        contract_type = signal.get('contract_type', "CALL" if action == 1 else "PUT")
+        contract_type = signal.contract_type or ("CALL" if action == 1 else "PUT")
         
         matched_contract = None
-        for c in contracts:
-            if c.get('contract_type') == contract_type:
-                matched_contract = c
-                break
+        if contracts_by_type is not None:
+            matched_contract = contracts_by_type.get(contract_type)
+        else:
+            for c in contracts:
+                if c.get('contract_type') == contract_type:
+                    matched_contract = c
+                    break
         
         if not matched_contract and contracts:
             matched_contract = contracts[0]
@@ -66,9 +92,9 @@ class TradeManager:
             "currency": "USD",
             "amount": final_stake,
             "basis": "stake",
-            "duration": signal.get('duration', 5), 
-            "duration_unit": signal.get('duration_unit', 't'),
-            "multiplier": signal.get('multiplier'), # Pass multiplier through
+            "duration": signal.duration, 
+            "duration_unit": signal.duration_unit,
+            "multiplier": signal.multiplier, # Pass multiplier through
             "validation_metadata": {
                 "original_stake": requested_stake,
                 "adjusted_stake": final_stake,
@@ -8,6 +8,8 @@ from typing import Dict, List, Deque
 from collections import deque
 import logging
 
+from .kernels import ema_series, wilder_rsi, wilder_adx
+
 logger = logging.getLogger(__name__)
 
 
@@ -185,27 +187,7 @@ class IndicatorLayer:
 
     def _wilder_rsi(self, closes: np.array, period: int) -> float:
         """Helper for Wilder's smoothed RSI."""
-        if len(closes) < period + 1:
-            return 50.0
-            
-        delta = np.diff(closes)
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-        
-        # Initial average: Simple Mean
-        avg_gain = np.mean(gain[:period])
-        avg_loss = np.mean(loss[:period])
-        
-        # Wilder's Smoothing (MMA)
-        for i in range(period, len(gain)):
-            avg_gain = (avg_gain * (period - 1) + gain[i]) / period
-            avg_loss = (avg_loss * (period - 1) + loss[i]) / period
-            
-        if avg_loss == 0:
-            return 100.0 if avg_gain > 0 else 50.0
-            
-        rs = avg_gain / avg_loss
-        return 100.0 - (100.0 / (1.0 + rs))
+        return float(wilder_rsi(np.asarray(closes, dtype=np.float64), period))
     
     # ===============================================
     # RSI HYBRID MODE METHODS
@@ -605,23 +587,15 @@ class IndicatorLayer:
         if len(self.prices) < slow + signal:
             return 0, 0, 0
             
-        prices = np.array(list(self.prices))
+        prices = np.array(self.prices, dtype=np.float64)
         
         # Calculate EMAs
-        def get_ema(data, period):
-            alpha = 2 / (period + 1)
-            ema = np.zeros_like(data)
-            ema[0] = data[0]
-            for i in range(1, len(data)):
-                ema[i] = alpha * data[i] + (1 - alpha) * ema[i-1]
-            return ema
-            
-        ema_fast = get_ema(prices, fast)
-        ema_slow = get_ema(prices, slow)
+        ema_fast = ema_series(prices, fast)
+        ema_slow = ema_series(prices, slow)
         macd_line = ema_fast - ema_slow
         
         # Proper Signal Line (EMA of MACD)
-        signal_line_series = get_ema(macd_line, signal)
+        signal_line_series = ema_series(macd_line, signal)
         
         macd_val = macd_line[-1]
         sig_val = signal_line_series[-1]
@@ -694,43 +668,9 @@ class IndicatorLayer:
         if len(self.highs) < period * 2: # ADX needs more data for smoothing
             return 0.0
         
-        highs = np.array(list(self.highs))
-        lows = np.array(list(self.lows))
-        closes = np.array(list(self.prices))
-        
-        # +DM, -DM
-        up_move = highs[1:] - highs[:-1]
-        down_move = lows[:-1] - lows[1:]
-        
-        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-        
-        # True Range
-        tr1 = highs[1:] - lows[1:]
-        tr2 = np.abs(highs[1:] - closes[:-1])
-        tr3 = np.abs(lows[1:] - closes[:-1])
-        tr = np.maximum(tr1, np.maximum(tr2, tr3))
-        
-        # Wilder's Smoothing for ATR, +DM, -DM
-        def wilders_smooth(data, p):
-            smoothed = np.zeros_like(data)
-            smoothed[p-1] = np.mean(data[:p])
-            for i in range(p, len(data)):
-                smoothed[i] = (smoothed[i-1] * (p - 1) + data[i]) / p
-            return smoothed
-            
-        atr_s = wilders_smooth(tr, period)
-        plus_dm_s = wilders_smooth(plus_dm, period)
-        minus_dm_s = wilders_smooth(minus_dm, period)
-        
-        # +DI, -DI
-        plus_di = 100 * (plus_dm_s / (atr_s + 1e-10))
-        minus_di = 100 * (minus_dm_s / (atr_s + 1e-10))
-        
-        # DX
-        dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10))
-        
-        # ADX (Smoothed DX)
-        adx_series = wilders_smooth(dx, period)
+        highs = np.array(self.highs, dtype=np.float64)
+        lows = np.array(self.lows, dtype=np.float64)
+        closes = np.array(self.prices, dtype=np.float64)
         
-        return float(adx_series[-1])
+        # +DM/-DM, True Range, Wilder's smoothing, DX and ADX fused in one kernel
+        return float(wilder_adx(highs, lows, closes, period))
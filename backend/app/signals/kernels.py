@@ -0,0 +1,228 @@
+"""
+Indicator Kernels
+Scalar rolling-indicator loops (EMA, Wilder smoothing, RSI, ADX, swing detection)
+the per-tick local SL/TP hit check and the RSI-to-probability mapping, compiled with Numba when it is installed.
+
+Numba is optional: without it `njit` degrades to a no-op decorator and the
+kernels run as plain Python/NumPy with identical results.
+"""
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, nogil=True)
+def ema_series(data, period):
+    """Exponential moving average series seeded with the first value."""
+    alpha = 2.0 / (period + 1)
+    ema = np.zeros_like(data)
+    ema[0] = data[0]
+    for i in range(1, len(data)):
+        ema[i] = alpha * data[i] + (1.0 - alpha) * ema[i - 1]
+    return ema
+
+
+@njit(cache=True, nogil=True)
+def wilders_smooth(data, period):
+    """Wilder's smoothing (RMA) seeded with the simple mean of the first `period` values."""
+    smoothed = np.zeros_like(data)
+    smoothed[period - 1] = np.mean(data[:period])
+    for i in range(period, len(data)):
+        smoothed[i] = (smoothed[i - 1] * (period - 1) + data[i]) / period
+    return smoothed
+
+
+@njit(cache=True, nogil=True)
+def wilder_rsi(closes, period):
+    """Latest Wilder's smoothed RSI value for a closes array."""
+    if len(closes) < period + 1:
+        return 50.0
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = closes[i] - closes[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period + 1, len(closes)):
+        delta = closes[i] - closes[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+
+    rs = avg_gain / avg_loss
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+@njit(cache=True, nogil=True)
+def _wilder_adx_fused(highs, lows, closes, period):
+    """Latest ADX value: Wilder-smoothed TR/+DM/-DM -> DX -> ADX in one pass per stage."""
+    n = len(highs) - 1
+    tr = np.empty(n)
+    plus_dm = np.empty(n)
+    minus_dm = np.empty(n)
+    for i in range(n):
+        up_move = highs[i + 1] - highs[i]
+        down_move = lows[i] - lows[i + 1]
+        plus_dm[i] = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm[i] = down_move if (down_move > up_move and down_move > 0) else 0.0
+        tr[i] = max(highs[i + 1] - lows[i + 1],
+                    abs(highs[i + 1] - closes[i]),
+                    abs(lows[i + 1] - closes[i]))
+
+    atr_s = wilders_smooth(tr, period)
+    plus_dm_s = wilders_smooth(plus_dm, period)
+    minus_dm_s = wilders_smooth(minus_dm, period)
+
+    dx = np.empty(n)
+    for i in range(n):
+        plus_di = 100 * (plus_dm_s[i] / (atr_s[i] + 1e-10))
+        minus_di = 100 * (minus_dm_s[i] / (atr_s[i] + 1e-10))
+        dx[i] = 100 * (abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10))
+
+    return wilders_smooth(dx, period)[-1]
+
+
+def _wilder_adx_numpy(highs, lows, closes, period):
+    """Latest ADX value with vectorized TR/+DM/-DM/DX (faster than the scalar loops without Numba)."""
+    up_move = highs[1:] - highs[:-1]
+    down_move = lows[:-1] - lows[1:]
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    tr = np.maximum(highs[1:] - lows[1:],
+                    np.maximum(np.abs(highs[1:] - closes[:-1]), np.abs(lows[1:] - closes[:-1])))
+
+    atr_s = wilders_smooth(tr, period)
+    plus_di = 100 * (wilders_smooth(plus_dm, period) / (atr_s + 1e-10))
+    minus_di = 100 * (wilders_smooth(minus_dm, period) / (atr_s + 1e-10))
+    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10))
+
+    return wilders_smooth(dx, period)[-1]
+
+
+# Fused scalar loops only pay off compiled; plain Python keeps the NumPy version
+wilder_adx = _wilder_adx_fused if NUMBA_AVAILABLE else _wilder_adx_numpy
+
+
+@njit(cache=True, nogil=True)
+def last_swings(closes, window):
+    """
+    Last swing-high / swing-low pivots over `window` points either side.
+    Returns NaN for a side with no pivot.
+    """
+    last_high = np.nan
+    last_low = np.nan
+    for i in range(window, len(closes) - window):
+        pivot = closes[i]
+        is_high = True
+        is_low = True
+        for j in range(i - window, i + window + 1):
+            if closes[j] > pivot:
+                is_high = False
+            if closes[j] < pivot:
+                is_low = False
+        if is_high:
+            last_high = pivot
+        if is_low:
+            last_low = pivot
+    return last_high, last_low
+
+
+@njit(cache=True, nogil=True)
+def sltp_hits(price, entries, sls, tps, is_buy):
+    """
+    Local SL/TP check of one symbol's contracts against the latest price.
+    NaN disables a level; a NaN entry skips the contract entirely.
+
+    Returns:
+        int8 array: 0 = no hit, 1 = stop loss hit, 2 = take profit hit
+    """
+    n = entries.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    for i in range(n):
+        if np.isnan(entries[i]):
+            continue
+        sl = sls[i]
+        tp = tps[i]
+        if is_buy[i]:
+            if not np.isnan(sl) and price <= sl:
+                out[i] = 1
+            elif not np.isnan(tp) and price >= tp:
+                out[i] = 2
+        else:
+            if not np.isnan(sl) and price >= sl:
+                out[i] = 1
+            elif not np.isnan(tp) and price <= tp:
+                out[i] = 2
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi_probabilities(rsi, allow_buy, allow_sell, confidence_modifier, flow_bullish, flow_bearish):
+    """
+    Buy/sell probabilities from the 1m RSI, tightened by the multi-timeframe
+    RSI confirmation and nudged by the 1m flow direction.
+
+    Returns:
+        (buy_prob, sell_prob)
+    """
+    # Base probability from 1m RSI
+    buy_prob = max(0.2, min(0.8, (70.0 - rsi) / 40.0))
+    sell_prob = max(0.2, min(0.8, (rsi - 30.0) / 40.0))
+
+    # Enhance with Multi-Timeframe Confirmation
+    if allow_buy:
+        buy_prob = max(buy_prob, 0.75 + confidence_modifier)
+        sell_prob = min(sell_prob, 0.25)
+    elif allow_sell:
+        sell_prob = max(sell_prob, 0.75 + confidence_modifier)
+        buy_prob = min(buy_prob, 0.25)
+
+    # Adjust by absolute direction
+    if flow_bullish:
+        buy_prob += 0.05
+    if flow_bearish:
+        sell_prob += 0.05
+    return buy_prob, sell_prob
+
+
+def warm_up():
+    """Compile every kernel on a tiny array so the first live tick doesn't pay the JIT cost."""
+    if not NUMBA_AVAILABLE:
+        return
+    dummy = np.linspace(1.0, 2.0, 32)
+    ema_series(dummy, 12)
+    wilders_smooth(dummy, 14)
+    wilder_rsi(dummy, 14)
+    wilder_adx(dummy, dummy, dummy, 14)
+    last_swings(dummy, 5)
+    sltp_hits(1.5, dummy, dummy, dummy, dummy > 1.5)
+    rsi_probabilities(50.0, False, False, 0.0, False, False)
+    logger.info("Indicator kernels JIT-compiled")
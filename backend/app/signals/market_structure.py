@@ -11,6 +11,10 @@ from typing import Dict
 from collections import deque
 import logging
 
+import numpy as np
+
+from .kernels import last_swings
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,25 +40,14 @@ class MarketStructure:
         Returns:
             (last_swing_high, last_swing_low)
         """
-        closes = list(self.closes)
-        if len(closes) < self.lookback * 2 + 3:
+        if len(self.closes) < self.lookback * 2 + 3:
             return None, None
 
-        last_high = None
-        last_low = None
-        window = self.lookback
-
-        for i in range(window, len(closes) - window):
-            left = closes[i - window : i]
-            right = closes[i + 1 : i + 1 + window]
-            pivot = closes[i]
-
-            if pivot == max(left + [pivot] + right):
-                last_high = pivot
-            if pivot == min(left + [pivot] + right):
-                last_low = pivot
-
-        return last_high, last_low
+        last_high, last_low = last_swings(np.array(self.closes, dtype=np.float64), self.lookback)
+        return (
+            None if np.isnan(last_high) else float(last_high),
+            None if np.isnan(last_low) else float(last_low),
+        )
 
     def _detect_fvg(self) -> bool:
         """
@@ -36,6 +36,9 @@ class MasterEngine:
         self.current_5m = None
         self.current_15m = None
         self.current_1h = None
+        # Timeframes whose candle closed (or was replaced by injection) since the
+        # consumer last drained this; popleft() keeps draining safe across threads.
+        self.closed_timeframes = deque()
         
         # --- 7. Market Memory System ---
         self.memory = {
@@ -53,7 +56,8 @@ class MasterEngine:
             "trend": {}, # {tf: {"value": str, "last_count": int}}
             "momentum": {}, # {tf: {"value": float, "last_count": int}}
             "volatility": {}, # {tf: {"value": str, "last_count": int}}
-            "atr": {} # {tf: {"value": float, "last_count": int}}
+            "atr": {}, # {tf: {"value": float, "last_count": int}}
+            "market_mode": {} # {"value": str, "last_count": int, "last_candle": Dict, "profile": Dict}
         }
         
         # --- 10. Current Symbol Context ---
@@ -77,6 +81,7 @@ class MasterEngine:
         self.current_5m = None
         self.current_15m = None
         self.current_1h = None
+        self.closed_timeframes.clear()
         
         # Reset Memory
         self.memory["confidence_scores"].clear()
@@ -156,6 +161,7 @@ class MasterEngine:
             if interval_start > ref["time"]:
                 # Close current
                 target_list.append(ref.copy())
+                self.closed_timeframes.append(period)
                 
                 # Start new
                 new_candle = {
@@ -185,6 +191,8 @@ class MasterEngine:
         elif timeframe == "5m": self.candles_5m = deque(candles, maxlen=200)
         elif timeframe == "15m": self.candles_15m = deque(candles, maxlen=200)
         elif timeframe == "1h": self.candles_1h = deque(candles, maxlen=100)
+        else: return
+        self.closed_timeframes.append(timeframe)
 
     # ==================================================================
     # 1. MULTI-TIMEFRAME ANALYZER
@@ -462,6 +470,24 @@ class MasterEngine:
         """
         if not candles or len(candles) < 50: return "range"
         
+        # Check Cache: closed candles never change, so the mode only moves when a new
+        # candle closes (or the symbol profile is swapped). Runs every tick otherwise.
+        cached = self.indicator_cache["market_mode"]
+        if (cached and cached["last_count"] == len(candles)
+                and cached["last_candle"] is candles[-1]
+                and cached["profile"] is self.current_profile):
+            return cached["value"]
+        
+        val = self._classify_market_mode(candles)
+        
+        # Update Cache
+        self.indicator_cache["market_mode"] = {
+            "value": val, "last_count": len(candles),
+            "last_candle": candles[-1], "profile": self.current_profile
+        }
+        return val
+
+    def _classify_market_mode(self, candles: List[Dict]) -> str:
         closes = np.array([c['close'] for c in candles])
         ema20 = self._ema(closes, 20)
         ema50 = self._ema(closes, 50)
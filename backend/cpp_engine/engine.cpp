@@ -1,5 +1,8 @@
 #include "json.hpp" // Using nlohmann/json
 #include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
 #include <iostream>
 #include <string>
 #include <unordered_map>
@@ -144,6 +147,19 @@ public:
     }
   }
 
+  // Same safety layer without the JSON round-trip (for the ctypes fast path)
+  bool execute_trade_native(const string &symbol, double stake,
+                            int active_trades, string &reason) {
+    ValidationResult val = validate_trade(stake, symbol, active_trades);
+    reason = val.error;
+    if (!val.valid)
+      return false;
+
+    // Update state
+    last_trade_time = std::chrono::steady_clock::now();
+    return true;
+  }
+
   // Set cooldown dynamically
   void set_cooldown(int seconds) { cooldown_seconds = seconds; }
 
@@ -168,11 +184,6 @@ TradingEngine engine;
 
 // --- C Exports for Python ctypes ---
 
-#include <cstring>
-
-#include <cstdlib>
-#include <cstring>
-
 extern "C" {
 
 void init_engine(const char *config_json) { engine.initialize(config_json); }
@@ -195,6 +206,19 @@ char *execute_trade(const char *params_json) {
   return cstr;
 }
 
+// Returns 1 if approved, 0 if rejected; the reason is copied into the
+// caller-owned buffer, so there is nothing to free_result()
+int execute_trade_native(const char *symbol, double stake, int active_trades,
+                         char *reason_buf, int reason_len) {
+  string reason;
+  bool approved =
+      engine.execute_trade_native(symbol, stake, active_trades, reason);
+  if (reason_buf && reason_len > 0) {
+    std::snprintf(reason_buf, reason_len, "%s", reason.c_str());
+  }
+  return approved ? 1 : 0;
+}
+
 void set_cooldown(int seconds) { engine.set_cooldown(seconds); }
 
 void set_bot_state(bool state) { engine.set_bot_state(state); }
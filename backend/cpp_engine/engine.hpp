@@ -32,6 +32,11 @@ const char *process_tick(const char *tick_json);
 //  "rate_limit_warning":false,"api_error":""}
 const char *execute_trade(const char *params_json);
 
+// Same safety layer with plain arguments (no JSON on either side).
+// Returns 1 if approved, 0 if rejected; the reason is written to reason_buf.
+int execute_trade_native(const char *symbol, double stake, int active_trades,
+                         char *reason_buf, int reason_len);
+
 // Runtime controls
 void set_cooldown(int seconds);
 void set_bot_state(bool state);
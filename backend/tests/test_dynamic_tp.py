@@ -0,0 +1,44 @@
+"""
+Vectorized trailing_updates against the scalar check_trailing_update it batches.
+"""
+
+import itertools
+
+import numpy as np
+
+from app.exits.dynamic_tp import DynamicTakeProfit
+
+
+def test_trailing_updates_matches_scalar_check():
+    dtp = DynamicTakeProfit()
+    entry = 100.0
+    prices = [95.0, 99.0, 99.75, 100.0, 100.25, 100.26, 101.0, 105.0]
+    sls = [-1.0, 0.0, 95.0, 99.0, 100.0, 101.0, 105.0]
+    rows = list(itertools.product(prices, sls, ("BUY", "SELL")))
+
+    new_sls = DynamicTakeProfit.trailing_updates(
+        np.array([price for price, _, _ in rows]),
+        np.full(len(rows), entry),
+        np.array([sl for _, sl, _ in rows]),
+        np.array([direction == "BUY" for _, _, direction in rows]),
+    )
+
+    for (price, sl, direction), new_sl in zip(rows, new_sls):
+        expected = dtp.check_trailing_update(price, entry, sl, direction)
+        assert (None if np.isnan(new_sl) else float(new_sl)) == expected, (price, sl, direction)
+
+
+def test_trailing_updates_random_positions():
+    dtp = DynamicTakeProfit()
+    rng = np.random.default_rng(11)
+    n = 500
+    entries = rng.uniform(50.0, 150.0, n)
+    prices = entries + rng.normal(0, 2.0, n)
+    sls = entries + rng.normal(0, 2.0, n)
+    is_buy = rng.random(n) < 0.5
+
+    new_sls = DynamicTakeProfit.trailing_updates(prices, entries, sls, is_buy)
+
+    for i in range(n):
+        expected = dtp.check_trailing_update(prices[i], entries[i], sls[i], "BUY" if is_buy[i] else "SELL")
+        assert (None if np.isnan(new_sls[i]) else float(new_sls[i])) == expected
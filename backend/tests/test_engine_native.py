@@ -0,0 +1,79 @@
+"""
+execute_trade_native against the JSON execute_trade path of the C++ safety layer.
+Builds cpp_engine/libengine.so when a compiler is available, otherwise skips.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from app.core.engine_wrapper import EngineWrapper
+
+CPP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cpp_engine"))
+
+
+@pytest.fixture(scope="module")
+def engine():
+    if not os.path.exists(os.path.join(CPP_DIR, "libengine.so")):
+        if shutil.which("make") is None or shutil.which("g++") is None:
+            pytest.skip("C++ toolchain not available")
+        subprocess.run(["make", "-s"], cwd=CPP_DIR, check=True)
+    try:
+        EngineWrapper._load_lib()
+    except OSError as e:
+        pytest.skip(f"libengine.so could not be loaded: {e}")
+    if not EngineWrapper.has_native_trade():
+        pytest.skip("libengine.so predates execute_trade_native")
+    EngineWrapper.init_engine('{"cooldown_seconds": 0}')
+    EngineWrapper.set_bot_state(True)
+    yield EngineWrapper
+    EngineWrapper.set_bot_state(True)
+    EngineWrapper.set_cooldown(0)
+
+
+def json_trade(symbol, stake, active_trades):
+    result = json.loads(EngineWrapper.execute_trade(json.dumps({
+        "symbol": symbol, "action": "BUY", "stake": stake, "active_trades": active_trades
+    })))
+    return result["status"] == "approved", result.get("reason", "OK")
+
+
+CASES = [
+    ("R_10", 1.0, 0),
+    ("R_10", 0.35, 0),
+    ("R_10", 0.34, 0),
+    ("R_10", 100.0, 9),
+    ("R_10", 100.01, 0),
+    ("R_10", 5.0, 10),
+    ("", 5.0, 0),
+]
+
+
+@pytest.mark.parametrize("symbol,stake,active_trades", CASES)
+def test_native_matches_json(engine, symbol, stake, active_trades):
+    assert engine.execute_trade_native(symbol, stake, active_trades) == json_trade(symbol, stake, active_trades)
+
+
+def test_native_matches_json_when_stopped(engine):
+    engine.set_bot_state(False)
+    try:
+        assert engine.execute_trade_native("R_10", 1.0, 0) == json_trade("R_10", 1.0, 0) == (False, "Bot is stopped")
+    finally:
+        engine.set_bot_state(True)
+
+
+def test_both_paths_start_the_cooldown(engine):
+    engine.set_cooldown(60)
+    try:
+        assert engine.execute_trade_native("R_10", 1.0, 0)[0] is False
+        engine.set_cooldown(0)
+        assert engine.execute_trade_native("R_10", 1.0, 0) == (True, "OK")
+        engine.set_cooldown(60)
+        native = engine.execute_trade_native("R_10", 1.0, 0)
+        assert native == json_trade("R_10", 1.0, 0)
+        assert native[0] is False and native[1].startswith("Cooldown active")
+    finally:
+        engine.set_cooldown(0)
@@ -0,0 +1,60 @@
+"""
+Local exit guards of DerivConnector: only contract updates (spot prices) may trigger them.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import deriv_connector as dc
+
+
+@pytest.fixture
+def connector(monkeypatch):
+    client = dc.deriv_client
+    exits = []
+
+    async def fake_send_exit_sell(self, contract_id, reason):
+        exits.append((contract_id, reason))
+
+    monkeypatch.setattr(dc.DerivConnector, "send_exit_sell", fake_send_exit_sell)
+    client._track_contract("123", {"contract_id": "123", "symbol": "R_100", "action": "BUY",
+                                   "entry_price": 1000.0, "stop_loss": 990.0, "take_profit": 1020.0})
+    yield client, exits
+    client._untrack_contract("123")
+    client.open_positions.pop("123", None)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_portfolio_sync_does_not_trigger_exits(connector):
+    client, exits = connector
+
+    async def main():
+        # Portfolio rows: buy_price is the stake and bid_price the contract value, not spot
+        await client.handle_portfolio({"contracts": [{
+            "contract_id": 123, "symbol": "R_100", "contract_type": "CALL",
+            "buy_price": 10.0, "bid_price": 9.5, "purchase_time": 0,
+        }]})
+        await settle()
+    asyncio.run(main())
+
+    assert exits == []
+    assert client.contract_metadata["123"]["stop_loss"] == 990.0
+
+
+def test_contract_update_triggers_stop_loss(connector):
+    client, exits = connector
+
+    async def main():
+        await client.handle_position_update({
+            "contract_id": 123, "underlying": "R_100", "contract_type": "CALL",
+            "entry_spot": 1000.0, "current_spot": 985.0, "profit": -5.0, "buy_price": 10.0,
+        })
+        await settle()
+    asyncio.run(main())
+
+    assert exits == [("123", "Stop Loss Hit (Local)")]
@@ -0,0 +1,221 @@
+"""
+Equivalence of the indicator kernels with the pure-Python/NumPy code they replaced,
+both compiled (when Numba is installed) and as plain Python.
+"""
+
+import numpy as np
+import pytest
+
+from app.signals import kernels
+
+KERNEL_MODES = [
+    pytest.param("compiled", marks=pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")),
+    "python",
+]
+
+
+def kernel(name, mode):
+    fn = getattr(kernels, name)
+    return getattr(fn, "py_func", fn) if mode == "python" else fn
+
+
+def random_walk(seed, n=300):
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.normal(0, 0.5, n))
+    highs = closes + rng.uniform(0, 0.4, n)
+    lows = closes - rng.uniform(0, 0.4, n)
+    return highs, lows, closes
+
+
+# --- Baseline implementations ---
+
+def baseline_ema(data, period):
+    alpha = 2 / (period + 1)
+    ema = np.zeros_like(data)
+    ema[0] = data[0]
+    for i in range(1, len(data)):
+        ema[i] = alpha * data[i] + (1 - alpha) * ema[i-1]
+    return ema
+
+
+def baseline_wilders_smooth(data, p):
+    smoothed = np.zeros_like(data)
+    smoothed[p-1] = np.mean(data[:p])
+    for i in range(p, len(data)):
+        smoothed[i] = (smoothed[i-1] * (p - 1) + data[i]) / p
+    return smoothed
+
+
+def baseline_wilder_rsi(closes, period):
+    if len(closes) < period + 1:
+        return 50.0
+    delta = np.diff(closes)
+    gain = np.where(delta > 0, delta, 0)
+    loss = np.where(delta < 0, -delta, 0)
+    avg_gain = np.mean(gain[:period])
+    avg_loss = np.mean(loss[:period])
+    for i in range(period, len(gain)):
+        avg_gain = (avg_gain * (period - 1) + gain[i]) / period
+        avg_loss = (avg_loss * (period - 1) + loss[i]) / period
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    rs = avg_gain / avg_loss
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+def baseline_adx(highs, lows, closes, period):
+    up_move = highs[1:] - highs[:-1]
+    down_move = lows[:-1] - lows[1:]
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
+    tr1 = highs[1:] - lows[1:]
+    tr2 = np.abs(highs[1:] - closes[:-1])
+    tr3 = np.abs(lows[1:] - closes[:-1])
+    tr = np.maximum(tr1, np.maximum(tr2, tr3))
+    atr_s = baseline_wilders_smooth(tr, period)
+    plus_dm_s = baseline_wilders_smooth(plus_dm, period)
+    minus_dm_s = baseline_wilders_smooth(minus_dm, period)
+    plus_di = 100 * (plus_dm_s / (atr_s + 1e-10))
+    minus_di = 100 * (minus_dm_s / (atr_s + 1e-10))
+    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10))
+    return float(baseline_wilders_smooth(dx, period)[-1])
+
+
+def baseline_swings(closes, window):
+    closes = list(closes)
+    last_high = None
+    last_low = None
+    for i in range(window, len(closes) - window):
+        left = closes[i - window : i]
+        right = closes[i + 1 : i + 1 + window]
+        pivot = closes[i]
+        if pivot == max(left + [pivot] + right):
+            last_high = pivot
+        if pivot == min(left + [pivot] + right):
+            last_low = pivot
+    return last_high, last_low
+
+
+def baseline_sltp(price, action, sl_price, tp_price):
+    if action == "BUY":
+        if sl_price is not None and price <= sl_price:
+            return 1
+        if tp_price is not None and price >= tp_price:
+            return 2
+    else:
+        if sl_price and price >= sl_price:
+            return 1
+        if tp_price and price <= tp_price:
+            return 2
+    return 0
+
+
+def baseline_probabilities(rsi, rsi_hybrid):
+    buy_prob = max(0.2, min(0.8, (70 - rsi) / 40))
+    sell_prob = max(0.2, min(0.8, (rsi - 30) / 40))
+    if rsi_hybrid.get("allow_buy"):
+        buy_prob = max(buy_prob, 0.75 + (rsi_hybrid.get("confidence_modifier", 0)))
+        sell_prob = min(sell_prob, 0.25)
+    elif rsi_hybrid.get("allow_sell"):
+        sell_prob = max(sell_prob, 0.75 + (rsi_hybrid.get("confidence_modifier", 0)))
+        buy_prob = min(buy_prob, 0.25)
+    if rsi_hybrid.get("flow_1m") == "bullish": buy_prob += 0.05
+    if rsi_hybrid.get("flow_1m") == "bearish": sell_prob += 0.05
+    return buy_prob, sell_prob
+
+
+# --- Tests ---
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+@pytest.mark.parametrize("seed", range(5))
+def test_ema_and_wilders_smooth(mode, seed):
+    _, _, closes = random_walk(seed)
+    for period in (9, 12, 26):
+        np.testing.assert_allclose(kernel("ema_series", mode)(closes, period), baseline_ema(closes, period))
+    for period in (5, 14):
+        np.testing.assert_allclose(kernel("wilders_smooth", mode)(closes, period),
+                                   baseline_wilders_smooth(closes, period))
+
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+@pytest.mark.parametrize("seed", range(5))
+def test_wilder_rsi(mode, seed):
+    _, _, closes = random_walk(seed)
+    wilder_rsi = kernel("wilder_rsi", mode)
+    for n in (10, 15, 16, 50, 300):
+        assert wilder_rsi(closes[:n], 14) == pytest.approx(baseline_wilder_rsi(closes[:n], 14), rel=1e-9)
+
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+def test_wilder_rsi_flat_and_monotonic(mode):
+    wilder_rsi = kernel("wilder_rsi", mode)
+    flat = np.full(30, 100.0)
+    rising = np.linspace(100.0, 110.0, 30)
+    assert wilder_rsi(flat, 14) == baseline_wilder_rsi(flat, 14) == 50.0
+    assert wilder_rsi(rising, 14) == baseline_wilder_rsi(rising, 14) == 100.0
+
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+@pytest.mark.parametrize("seed", range(5))
+def test_wilder_adx(mode, seed):
+    highs, lows, closes = random_walk(seed, n=120)
+    assert kernel("wilder_adx", mode)(highs, lows, closes, 14) == pytest.approx(
+        baseline_adx(highs, lows, closes, 14), rel=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_wilder_adx_numpy_fallback(seed):
+    highs, lows, closes = random_walk(seed, n=120)
+    assert kernels._wilder_adx_numpy(highs, lows, closes, 14) == pytest.approx(
+        baseline_adx(highs, lows, closes, 14), rel=1e-9)
+
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+@pytest.mark.parametrize("seed", range(5))
+def test_last_swings(mode, seed):
+    _, _, closes = random_walk(seed, n=80)
+    # Rounded closes produce ties, which the pivot comparison must treat the same way
+    for data in (closes, np.round(closes)):
+        high, low = kernel("last_swings", mode)(data, 5)
+        expected_high, expected_low = baseline_swings(data, 5)
+        assert (None if np.isnan(high) else high) == expected_high
+        assert (None if np.isnan(low) else low) == expected_low
+
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+def test_sltp_hits(mode):
+    rng = np.random.default_rng(7)
+    levels = [None, 0.0, 98.0, 99.5, 100.0, 100.5, 102.0]
+    rows = [(action, sl, tp) for action in ("BUY", "SELL") for sl in levels for tp in levels]
+    sltp_hits = kernel("sltp_hits", mode)
+    for price in np.concatenate([[98.0, 100.0, 102.0], rng.uniform(97.0, 103.0, 20)]):
+        entries = np.full(len(rows), 100.0)
+        sls = np.array([np.nan if sl is None else sl for _, sl, _ in rows])
+        tps = np.array([np.nan if tp is None else tp for _, _, tp in rows])
+        is_buy = np.array([action == "BUY" for action, _, _ in rows])
+        # SELL levels are truthiness-checked, so the caller passes a zero level as unset
+        sls[~is_buy & (sls == 0)] = np.nan
+        tps[~is_buy & (tps == 0)] = np.nan
+        hits = sltp_hits(float(price), entries, sls, tps, is_buy)
+        assert list(hits) == [baseline_sltp(price, *row) for row in rows]
+
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+def test_sltp_hits_skips_missing_entry(mode):
+    hits = kernel("sltp_hits", mode)(100.0, np.array([np.nan]), np.array([101.0]),
+                                      np.array([np.nan]), np.array([True]))
+    assert list(hits) == [0]
+
+
+@pytest.mark.parametrize("mode", KERNEL_MODES)
+def test_rsi_probabilities(mode):
+    rsi_probabilities = kernel("rsi_probabilities", mode)
+    for rsi in (0.0, 20.0, 30.0, 45.5, 50.0, 62.0, 70.0, 85.0, 100.0):
+        for allow_buy, allow_sell in ((False, False), (True, False), (False, True), (True, True)):
+            for modifier in (-0.1, 0.0, 0.05):
+                for flow in ("bullish", "bearish", "neutral"):
+                    hybrid = {"allow_buy": allow_buy, "allow_sell": allow_sell,
+                              "confidence_modifier": modifier, "flow_1m": flow}
+                    got = rsi_probabilities(rsi, allow_buy, allow_sell, modifier,
+                                            flow == "bullish", flow == "bearish")
+                    assert got == pytest.approx(baseline_probabilities(rsi, hybrid))
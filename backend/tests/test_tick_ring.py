@@ -0,0 +1,113 @@
+"""
+TickRing buffering and the per-symbol tick consumers of DerivConnector.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import deriv_connector as dc
+from app.services.deriv_connector import TickRing
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_ring_pops_in_order():
+    async def main():
+        ring = TickRing(8)
+        for i in range(5):
+            ring.push(i)
+        return [await ring.pop() for _ in range(5)]
+    assert run(main()) == [0, 1, 2, 3, 4]
+
+
+def test_ring_overwrites_oldest_when_full():
+    async def main():
+        ring = TickRing(3)
+        for i in range(5):
+            ring.push(i)
+        return [await ring.pop() for _ in range(3)]
+    assert run(main()) == [2, 3, 4]
+
+
+def test_pop_waits_for_push():
+    async def main():
+        ring = TickRing(4)
+        pending = asyncio.create_task(ring.pop())
+        await asyncio.sleep(0)
+        assert not pending.done()
+        ring.push("tick")
+        return await asyncio.wait_for(pending, 1)
+    assert run(main()) == "tick"
+
+
+@pytest.fixture
+def connector(monkeypatch):
+    client = dc.deriv_client
+    handled = []
+
+    async def fake_handle_tick(self, tick):
+        if tick.get("fail"):
+            raise RuntimeError("boom")
+        await asyncio.sleep(0)
+        handled.append((tick["symbol"], tick["quote"]))
+
+    monkeypatch.setattr(dc.DerivConnector, "handle_tick", fake_handle_tick)
+    client._stop_tick_consumers()
+    yield client, handled
+    client._stop_tick_consumers()
+
+
+async def drain():
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+def test_consumers_keep_per_symbol_order(connector):
+    client, handled = connector
+
+    async def main():
+        for i in range(10):
+            client._enqueue_tick({"symbol": "R_10", "quote": i})
+            client._enqueue_tick({"symbol": "R_25", "quote": i})
+        await drain()
+        client._stop_tick_consumers()
+    run(main())
+
+    assert [q for s, q in handled if s == "R_10"] == list(range(10))
+    assert [q for s, q in handled if s == "R_25"] == list(range(10))
+
+
+def test_consumer_survives_handler_error(connector):
+    client, handled = connector
+
+    async def main():
+        client._enqueue_tick({"symbol": "R_10", "quote": 1, "fail": True})
+        client._enqueue_tick({"symbol": "R_10", "quote": 2})
+        await drain()
+        task = client._tick_consumers["R_10"]
+        client._stop_tick_consumers()
+        return task
+    task = run(main())
+
+    assert handled == [("R_10", 2)]
+    assert task.cancelled()
+
+
+def test_stop_cancels_consumers_and_drops_rings(connector):
+    client, _ = connector
+
+    async def main():
+        client._enqueue_tick({"symbol": "R_10", "quote": 1})
+        client._enqueue_tick({"symbol": "R_50", "quote": 1})
+        tasks = list(client._tick_consumers.values())
+        assert set(client._tick_consumers) == set(client._tick_rings) == {"R_10", "R_50"}
+        client._stop_tick_consumers()
+        await drain()
+        return tasks
+    tasks = run(main())
+
+    assert all(task.cancelled() for task in tasks)
+    assert client._tick_consumers == {} and client._tick_rings == {}
@@ -368,6 +368,19 @@ export const TradingProvider = ({ children }: { children: ReactNode }) => {
                             return { ...prev, [tick.symbol]: newSymbolTicks };
                         });
                     }
+                    if (data.type === 'ticks' && Array.isArray(data.data)) {
+                        // Coalesced batch (oldest first): apply all ticks in one state update
+                        const batch = data.data;
+                        setDerivTicks(prev => {
+                            const next = { ...prev };
+                            for (const tick of batch) {
+                                const symbolTicks = next[tick.symbol] || [];
+                                // Keep last 50 ticks per symbol
+                                next[tick.symbol] = [tick, ...symbolTicks].slice(0, 50);
+                            }
+                            return next;
+                        });
+                    }
                     if (data.type === 'log' && data.data) setLogs(prev => {
                         if (prev.some(l => l.id === data.data.id)) return prev;
                         return [data.data, ...prev].slice(0, 100);